@@ -1,6 +1,44 @@
 """MPRIS integration for aiosendspin."""
 
-from aiosendspin_mpris.adapter import MPRIS_AVAILABLE
-from aiosendspin_mpris.mpris import SendspinMpris
+from __future__ import annotations
 
-__all__ = ["MPRIS_AVAILABLE", "SendspinMpris"]
+import importlib
+from typing import TYPE_CHECKING, cast
+
+from aiosendspin_mpris.mpris import MPRIS_AVAILABLE, SendspinMpris
+from aiosendspin_mpris.state import StateUpdate
+
+if TYPE_CHECKING:
+    from aiosendspin_mpris.artwork import ArtworkCache
+    from aiosendspin_mpris.bus import MprisBusManager
+    from aiosendspin_mpris.metrics import MprisMetrics
+    from aiosendspin_mpris.replay import EventRecorder, EventReplayer
+
+# Optional features, only imported when first accessed
+_LAZY_EXPORTS = {
+    "ArtworkCache": "aiosendspin_mpris.artwork",
+    "EventRecorder": "aiosendspin_mpris.replay",
+    "EventReplayer": "aiosendspin_mpris.replay",
+    "MprisBusManager": "aiosendspin_mpris.bus",
+    "MprisMetrics": "aiosendspin_mpris.metrics",
+}
+
+__all__ = [
+    "MPRIS_AVAILABLE",
+    "ArtworkCache",
+    "EventRecorder",
+    "EventReplayer",
+    "MprisBusManager",
+    "MprisMetrics",
+    "SendspinMpris",
+    "StateUpdate",
+]
+
+
+def __getattr__(name: str) -> object:
+    """Import the optional features on first access."""
+    if (module := _LAZY_EXPORTS.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = cast("object", getattr(importlib.import_module(module), name))
+    globals()[name] = value
+    return value
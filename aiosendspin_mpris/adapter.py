@@ -1,90 +1,67 @@
-"""Internal MPRIS adapter implementation."""
+"""Internal MPRIS adapter implementation.
 
-# pyright: reportPossiblyUnboundVariable=false
+This module requires mpris_api and is only imported once the MPRIS service starts.
+"""
 
 from __future__ import annotations
 
 import asyncio
 import logging
-import sys
-from dataclasses import dataclass, field
+import time
+from dataclasses import dataclass
+from functools import cached_property, partial
 from typing import TYPE_CHECKING, override
 
 from aiosendspin.models.types import MediaCommand, PlaybackStateType
+from mpris_api.adapter.IMprisAdapterPlayer import IMprisAdapterPlayer
+from mpris_api.adapter.IMprisAdapterPlayLists import IMprisAdapterPlayLists
+from mpris_api.adapter.IMprisAdapterRoot import IMprisAdapterRoot
+from mpris_api.adapter.IMprisAdapterTrackList import IMprisAdapterTrackList
+from mpris_api.common.DbusObject import DbusObject
+from mpris_api.model.MprisLoopStatus import MprisLoopStatus
+from mpris_api.model.MprisMetaData import MprisMetaData
+from mpris_api.model.MprisPlaybackStatus import MprisPlaybackStatus
+from mpris_api.model.MprisPlaylist import MprisPlaylist
+from mpris_api.model.MprisPlaylistOrdering import MprisPlaylistOrdering
+from tunit.unit import Microseconds
+
+from .commands import SEEK_COMMAND, CommandQueue
+from .state import MprisState, MprisStateTracker
 
 if TYPE_CHECKING:
-    from aiosendspin.client import SendspinClient
-    from tunit.unit import Microseconds
+    from dbus_next.signature import Variant
 
 _LOGGER = logging.getLogger(__name__)
 
-# MPRIS is only available on Linux with mpris_api installed
-MPRIS_AVAILABLE = False
-
-if sys.platform == "linux":
-    try:
-        from mpris_api.adapter.IMprisAdapterPlayer import IMprisAdapterPlayer
-        from mpris_api.adapter.IMprisAdapterPlayLists import IMprisAdapterPlayLists
-        from mpris_api.adapter.IMprisAdapterRoot import IMprisAdapterRoot
-        from mpris_api.adapter.IMprisAdapterTrackList import IMprisAdapterTrackList
-        from mpris_api.common.DbusObject import DbusObject
-        from mpris_api.model.MprisLoopStatus import MprisLoopStatus
-        from mpris_api.model.MprisMetaData import MprisMetaData
-        from mpris_api.model.MprisPlaybackStatus import MprisPlaybackStatus
-        from mpris_api.model.MprisPlaylist import MprisPlaylist
-        from mpris_api.model.MprisPlaylistOrdering import MprisPlaylistOrdering
-        from tunit.unit import Microseconds
-
-        MPRIS_AVAILABLE = True  # pyright: ignore[reportConstantRedefinition]
-    except ImportError:
-        pass
-
-if not MPRIS_AVAILABLE:
-
-    class _DummyIMprisAdapterRoot:
-        """Dummy adapter base class when mpris_api is not installed."""
-
-        def __init__(self) -> None:
-            pass
 
-    class _DummyIMprisAdapterPlayer:
-        """Dummy adapter base class when mpris_api is not installed."""
+class CachedMprisMetaData(MprisMetaData):
+    """MprisMetaData that marshals its D-Bus variant dict only once.
 
-        def __init__(self) -> None:
-            pass
-
-    class _DummyIMprisAdapterTrackList:
-        """Dummy adapter base class when mpris_api is not installed."""
+    Instances are immutable, so the variant dict built on the first getValue()
+    call is reused by every later Metadata read and PropertiesChanged emission.
+    """
 
-        def __init__(self) -> None:
-            pass
+    @cached_property
+    def _value(self) -> dict[str, Variant]:
+        return super().getValue()
 
-    class _DummyIMprisAdapterPlayLists:
-        """Dummy adapter base class when mpris_api is not installed."""
+    @override
+    def getValue(self) -> dict[str, Variant]:
+        return self._value
 
-        def __init__(self) -> None:
-            pass
 
-    if not TYPE_CHECKING:  # otherwise pyright complains too much
-        IMprisAdapterRoot = _DummyIMprisAdapterRoot
-        IMprisAdapterPlayer = _DummyIMprisAdapterPlayer
-        IMprisAdapterTrackList = _DummyIMprisAdapterTrackList
-        IMprisAdapterPlayLists = _DummyIMprisAdapterPlayLists
+@dataclass(frozen=True, slots=True)
+class _MetadataCacheEntry:
+    """Built MPRIS metadata together with the state it was built from."""
 
+    version: int
+    track: tuple[object, ...]
+    metadata: MprisMetaData
 
-@dataclass
-class MprisState:
-    """Internal state for MPRIS adapter."""
 
-    supported_commands: set[MediaCommand] = field(default_factory=set)
-    playback_state: PlaybackStateType | None = None
-    volume: int = 100
-    muted: bool = False
-    title: str | None = None
-    artist: str | None = None
-    album: str | None = None
-    duration_ms: int | None = None
-    progress_ms: int | None = None
+def _track_object(state: MprisState) -> DbusObject:
+    """Return the MPRIS track id object of the track in a state snapshot."""
+    return DbusObject.fromName(f"sendspin_track_{state.track_id or 'none'}")
 
 
 class SendspinMprisAdapterRoot(IMprisAdapterRoot):
@@ -159,21 +136,24 @@ class SendspinMprisAdapterRoot(IMprisAdapterRoot):
 class SendspinMprisAdapterPlayer(IMprisAdapterPlayer):
     """Adapter bridging Sendspin state to MPRIS Player interface.
 
-    This adapter reads state from an internal MprisState dataclass and
-    dispatches commands to the SendspinClient.
+    This adapter reads state from the current MprisState snapshot of an
+    MprisStateTracker and dispatches commands to the SendspinClient through
+    a CommandQueue.
     """
 
-    _client: SendspinClient
+    _commands: CommandQueue
     _loop: asyncio.AbstractEventLoop
-    _state: MprisState
+    _tracker: MprisStateTracker
+    _metadata_cache: _MetadataCacheEntry | None
 
     def __init__(
-        self, client: SendspinClient, loop: asyncio.AbstractEventLoop, state: MprisState
+        self, commands: CommandQueue, loop: asyncio.AbstractEventLoop, tracker: MprisStateTracker
     ) -> None:
         """Initialize the MPRIS player adapter."""
-        self._client = client
+        self._commands = commands
         self._loop = loop
-        self._state = state
+        self._tracker = tracker
+        self._metadata_cache = None
 
     @override
     def canControl(self) -> bool:
@@ -183,27 +163,27 @@ class SendspinMprisAdapterPlayer(IMprisAdapterPlayer):
     @override
     def canPlay(self) -> bool:
         """Return whether play is supported."""
-        return MediaCommand.PLAY in self._state.supported_commands
+        return MediaCommand.PLAY in self._tracker.state.supported_commands
 
     @override
     def canPause(self) -> bool:
         """Return whether pause is supported."""
-        return MediaCommand.PAUSE in self._state.supported_commands
+        return MediaCommand.PAUSE in self._tracker.state.supported_commands
 
     @override
     def canGoNext(self) -> bool:
         """Return whether next track is supported."""
-        return MediaCommand.NEXT in self._state.supported_commands
+        return MediaCommand.NEXT in self._tracker.state.supported_commands
 
     @override
     def canGoPrevious(self) -> bool:
         """Return whether previous track is supported."""
-        return MediaCommand.PREVIOUS in self._state.supported_commands
+        return MediaCommand.PREVIOUS in self._tracker.state.supported_commands
 
     @override
     def canSeek(self) -> bool:
         """Return whether seeking is supported."""
-        return False
+        return SEEK_COMMAND is not None and SEEK_COMMAND in self._tracker.state.supported_commands
 
     @override
     def getMinimumRate(self) -> float:
@@ -227,9 +207,10 @@ class SendspinMprisAdapterPlayer(IMprisAdapterPlayer):
     @override
     def getVolume(self) -> float:
         """Return current volume as 0.0-1.0."""
-        if self._state.muted:
+        state = self._tracker.state
+        if state.muted:
             return 0.0
-        return self._state.volume / 100.0
+        return state.volume / 100.0
 
     @override
     def setVolume(self, value: float) -> None:
@@ -239,29 +220,59 @@ class SendspinMprisAdapterPlayer(IMprisAdapterPlayer):
 
     @override
     def getMetadata(self) -> MprisMetaData:
-        """Return current track metadata in MPRIS format."""
-        duration_us = Microseconds((self._state.duration_ms or 0) * 1000)
-        return MprisMetaData(
-            trackId=DbusObject.fromName("sendspin_track_current"),
+        """Return current track metadata in MPRIS format.
+
+        Desktop shells poll Metadata very often, so the built object (and its marshalled
+        variant dict) is cached per state version and only rebuilt when a track field
+        actually changed.
+        """
+        state = self._tracker.state
+        cache = self._metadata_cache
+        if cache is not None and cache.version == state.version:
+            return cache.metadata
+
+        track = (
+            state.track_id,
+            state.title,
+            state.artist,
+            state.album,
+            state.duration_ms,
+            state.art_url,
+        )
+        metadata = (
+            cache.metadata
+            if cache is not None and cache.track == track
+            else self._build_metadata(state)
+        )
+        self._metadata_cache = _MetadataCacheEntry(state.version, track, metadata)
+        return metadata
+
+    def _build_metadata(self, state: MprisState) -> MprisMetaData:
+        """Build MPRIS metadata from a state snapshot."""
+        duration_us = Microseconds((state.duration_ms or 0) * 1000)
+        return CachedMprisMetaData(
+            trackId=_track_object(state),
             length=duration_us,
-            title=self._state.title or "",
-            artists=[self._state.artist] if self._state.artist else None,
-            album=self._state.album or "",
+            artUrl=state.art_url,
+            title=state.title or "",
+            artists=[state.artist] if state.artist else None,
+            album=state.album or "",
         )
 
     @override
     def getPlaybackStatus(self) -> MprisPlaybackStatus:
         """Return current playback state."""
-        if self._state.playback_state == PlaybackStateType.PLAYING:
+        playback_state = self._tracker.state.playback_state
+        if playback_state == PlaybackStateType.PLAYING:
             return MprisPlaybackStatus.PLAYING
-        if self._state.playback_state == PlaybackStateType.PAUSED:
+        if playback_state == PlaybackStateType.PAUSED:
             return MprisPlaybackStatus.PAUSED
         return MprisPlaybackStatus.STOPPED
 
     @override
     def getPosition(self) -> Microseconds:
-        """Return current track position in microseconds."""
-        return Microseconds((self._state.progress_ms or 0) * 1000)
+        """Return current track position in microseconds, extrapolated while playing."""
+        return Microseconds(self._tracker.state.position_us(time.monotonic_ns()))
 
     @override
     def getLoopStatus(self) -> MprisLoopStatus:
@@ -308,24 +319,79 @@ class SendspinMprisAdapterPlayer(IMprisAdapterPlayer):
 
     @override
     def seek(self, position: Microseconds, trackId: str | None = None) -> None:
-        """Seek to position (not supported)."""
+        """Seek to an absolute position, for both Seek and SetPosition (with trackId).
+
+        As the MPRIS spec requires, SetPosition is ignored for another track or a
+        position outside the track, and seeking past the end skips to the next track.
+        """
+        command = SEEK_COMMAND
+        if command is None or command not in self._tracker.state.supported_commands:
+            return
+
+        state = self._tracker.state
+        position_us = int(position)
+        duration_us = (state.duration_ms or 0) * 1000
+        if trackId is not None:
+            if trackId != str(_track_object(state)) or position_us < 0:
+                return
+            if duration_us and position_us > duration_us:
+                return
+        elif duration_us and position_us > duration_us:
+            if self.canGoNext():
+                self.next()
+            return
+
+        self._dispatch_command(command, position_ms=max(0, position_us) // 1000)
 
     @override
     def openUri(self, uri: str) -> None:
         """Open URI (not supported)."""
 
     def _dispatch_command(
-        self, command: MediaCommand, *, volume: int | None = None, mute: bool | None = None
+        self,
+        command: MediaCommand,
+        *,
+        volume: int | None = None,
+        mute: bool | None = None,
+        position_ms: int | None = None,
     ) -> None:
-        """Dispatch command to async handler via thread-safe mechanism."""
+        """Dispatch command to the command queue on the client's event loop.
+
+        When the D-Bus service runs in-loop, the command is queued directly; otherwise
+        it crosses over from the D-Bus thread via the thread-safe mechanism.
+        """
+        dispatched_at = time.perf_counter()
+        if self._on_loop():
+            self._commands.submit(
+                command,
+                volume=volume,
+                mute=mute,
+                position_ms=position_ms,
+                dispatched_at=dispatched_at,
+            )
+            return
+
         try:
-            _ = asyncio.run_coroutine_threadsafe(
-                self._client.send_group_command(command, volume=volume, mute=mute),
-                self._loop,
+            _ = self._loop.call_soon_threadsafe(
+                partial(
+                    self._commands.submit,
+                    command,
+                    volume=volume,
+                    mute=mute,
+                    position_ms=position_ms,
+                    dispatched_at=dispatched_at,
+                )
             )
         except RuntimeError:
             _LOGGER.debug("Failed to dispatch MPRIS command: event loop not available")
 
+    def _on_loop(self) -> bool:
+        """Return whether the caller is running on the client's event loop."""
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
 
 class SendspinMprisAdapterTrackList(IMprisAdapterTrackList):
     """Stub adapter for the MPRIS TrackList interface.
@@ -0,0 +1,289 @@
+"""Content-addressed on-disk cache for the album art published through MPRIS."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import importlib.util
+import io
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+_LOGGER = logging.getLogger(__name__)
+
+# Downscaling artwork requires Pillow, installed with the "artwork" extra
+PILLOW_AVAILABLE = importlib.util.find_spec("PIL") is not None
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Quality of the JPEG images downscaled artwork is re-encoded to, unless transparent
+_JPEG_QUALITY = 85
+
+# Leading bytes of the image formats artwork is sent in, and their file extension
+_IMAGE_SIGNATURES: tuple[tuple[bytes, str], ...] = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF8", ".gif"),
+    (b"BM", ".bmp"),
+)
+
+
+def default_directory() -> Path:
+    """Return the default artwork cache directory, under $XDG_RUNTIME_DIR if set."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "aiosendspin-mpris" / "artwork"
+    return Path(tempfile.gettempdir()) / f"aiosendspin-mpris-{os.getuid()}" / "artwork"
+
+
+def image_extension(data: bytes) -> str:
+    """Return the file extension of an image from its leading bytes."""
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return ".webp"
+    for signature, extension in _IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return extension
+    return ".img"
+
+
+class ArtworkCache:
+    """Store artwork images as files named after the hash of their content.
+
+    The same image is only ever written once and always published under the same
+    `file://` URL, so repeated tracks and albums reuse one file. When the files exceed
+    `max_bytes`, the least recently stored or reused ones are removed.
+
+    With `max_pixels`, larger images are downscaled to fit and re-encoded before being
+    stored, so desktop widgets do not have to decode full resolution artwork; only the
+    small variant is stored and published. Results are keyed by the hash of the source
+    image and the target size, so an image is only ever resized once, even when
+    requested again concurrently or after a restart.
+
+    Hashing, resizing and all file system access run in a thread pool, off the event
+    loop.
+
+    One cache may be shared by several SendspinMpris instances on the same event loop.
+
+    Example usage:
+        ```python
+        cache = ArtworkCache()
+        mpris = SendspinMpris(client, artwork_cache=cache)
+        ```
+    """
+
+    _directory: Path
+    _max_bytes: int
+    _max_pixels: int | None
+    _executor: Executor | None
+    _entries: OrderedDict[str, tuple[str, int]]
+    _size: int
+    _pending: dict[str, asyncio.Task[str]]
+    _loading: asyncio.Task[None] | None
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str] | None = None,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_pixels: int | None = None,
+        executor: Executor | None = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            directory: Directory the images are stored in; created if missing
+                (default: aiosendspin-mpris/artwork under $XDG_RUNTIME_DIR).
+            max_bytes: Total size of the stored images above which the least recently
+                used ones are removed (default: 32 MiB).
+            max_pixels: If set, images wider or taller than this are downscaled to fit,
+                e.g. 256 for desktop media widgets. Requires Pillow (default: None,
+                images are stored as received).
+            executor: Executor running the hashing, resizing and file system work
+                (default: the event loop's default executor).
+
+        """
+        self._directory = Path(directory) if directory is not None else default_directory()
+        self._max_bytes = max_bytes
+        self._max_pixels = max_pixels
+        if max_pixels is not None and not PILLOW_AVAILABLE:
+            _LOGGER.warning("Pillow is not installed; artwork is stored without downscaling")
+            self._max_pixels = None
+        self._executor = executor
+        self._entries = OrderedDict()
+        self._size = 0
+        self._pending = {}
+        self._loading = None
+
+    @property
+    def directory(self) -> Path:
+        """Return the directory the images are stored in."""
+        return self._directory
+
+    @property
+    def size(self) -> int:
+        """Return the total size, in bytes, of the stored images."""
+        return self._size
+
+    async def store(self, data: bytes) -> str:
+        """Store an image, unless already stored, and return its `file://` URL."""
+        loop = asyncio.get_running_loop()
+        await self._load()
+        key = await loop.run_in_executor(self._executor, _digest, data)
+        if self._max_pixels is not None:
+            key = f"{key}-{self._max_pixels}"
+
+        if (entry := self._entries.get(key)) is not None:
+            self._entries.move_to_end(key)
+            return (self._directory / entry[0]).as_uri()
+
+        # Concurrent requests for the same image share one resize and write, which runs
+        # in its own task so that a cancelled request does not abort it for the others
+        if (pending := self._pending.get(key)) is None:
+            pending = asyncio.create_task(self._write(key, data))
+            self._pending[key] = pending
+        return await asyncio.shield(pending)
+
+    async def _write(self, key: str, data: bytes) -> str:
+        """Resize and write an image, add it to the cache and return its URL."""
+        loop = asyncio.get_running_loop()
+        try:
+            name, size = await loop.run_in_executor(
+                self._executor, _write_image, self._directory, key, data, self._max_pixels
+            )
+        finally:
+            del self._pending[key]
+
+        self._entries[key] = (name, size)
+        self._size += size
+        self._evict()
+        return (self._directory / name).as_uri()
+
+    async def _load(self) -> None:
+        """Index the images stored by an earlier run, once."""
+        if self._loading is None:
+            self._loading = asyncio.create_task(self._index())
+        try:
+            await asyncio.shield(self._loading)
+        except Exception:
+            # E.g. the directory could not be created; try again with the next image
+            self._loading = None
+            raise
+
+    async def _index(self) -> None:
+        loop = asyncio.get_running_loop()
+        files = await loop.run_in_executor(self._executor, _scan_directory, self._directory)
+        for name, size in files:
+            key = name.partition(".")[0]
+            if key not in self._entries:
+                self._entries[key] = (name, size)
+                self._entries.move_to_end(key, last=False)
+                self._size += size
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used images until the cache fits its size bound."""
+        removed: list[Path] = []
+        # The most recent image is always kept, even if larger than the bound
+        while self._size > self._max_bytes and len(self._entries) > 1:
+            _, (name, size) = self._entries.popitem(last=False)
+            self._size -= size
+            removed.append(self._directory / name)
+        if removed:
+            loop = asyncio.get_running_loop()
+            _ = loop.run_in_executor(self._executor, _remove_files, removed)
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_image(directory: Path, key: str, data: bytes, max_pixels: int | None) -> tuple[str, int]:
+    """Downscale an image if requested, write it and return its file name and size."""
+    if max_pixels is not None:
+        try:
+            data = _downscale(data, max_pixels)
+        except Exception as err:
+            _LOGGER.debug("Failed to downscale artwork, storing it as received: %s", err)
+    name = key + image_extension(data)
+    _write_file(directory / name, data)
+    return name, len(data)
+
+
+def _downscale(data: bytes, max_pixels: int) -> bytes:
+    """Return an image fitting in max_pixels x max_pixels, re-encoded if it was larger."""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        if max(image.size) <= max_pixels:
+            return data
+
+        # Let JPEG decoding skip to the closest larger scale, which is much faster
+        _ = image.draft("RGB", (max_pixels, max_pixels))
+        image.thumbnail((max_pixels, max_pixels), Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        if image.mode in {"RGBA", "LA", "PA"} or "transparency" in image.info:
+            image.save(output, "PNG", optimize=True)
+        else:
+            image.convert("RGB").save(output, "JPEG", quality=_JPEG_QUALITY, optimize=True)
+        return output.getvalue()
+
+
+def _scan_directory(directory: Path) -> list[tuple[str, int]]:
+    """Create the directory if missing, and return its images from newest to oldest."""
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    files: list[tuple[float, str, int]] = []
+    for path in directory.iterdir():
+        if path.name.startswith("."):
+            continue
+        with contextlib.suppress(OSError):
+            stat = path.stat()
+            files.append((stat.st_mtime, path.name, stat.st_size))
+    return [(name, size) for _, name, size in sorted(files, reverse=True)]
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    """Write a file atomically, so a reader never sees a partial image."""
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            _ = file.write(data)
+        _ = Path(temp_path).replace(path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            Path(temp_path).unlink()
+        raise
+
+
+def _remove_files(paths: list[Path]) -> None:
+    for path in paths:
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as err:
+            _LOGGER.debug("Failed to remove cached artwork %s: %s", path, err)
+
+
+async def fetch_image(url: str, *, max_bytes: int = DEFAULT_MAX_BYTES) -> bytes:
+    """Download an image, e.g. from the artwork URL the server sends with the metadata.
+
+    Raises:
+        ValueError: If the image is larger than `max_bytes`.
+
+    """
+    import aiohttp
+
+    async with aiohttp.ClientSession() as session, session.get(url) as response:
+        _ = response.raise_for_status()
+        data = bytearray()
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            data += chunk
+            if len(data) > max_bytes:
+                raise ValueError(f"Image larger than {max_bytes} bytes")
+    return bytes(data)
@@ -0,0 +1,200 @@
+"""Shared D-Bus dispatcher for multiple SendspinMpris instances."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import itertools
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from dbus_next.constants import RequestNameReply
+
+    from .mpris_service import PatchedMprisService
+
+_LOGGER = logging.getLogger(__name__)
+
+_MPRIS_BUS_NAME_PREFIX = "org.mpris.MediaPlayer2"
+
+
+class MprisBusManager:
+    """Run the D-Bus side of many SendspinMpris instances on one dispatcher.
+
+    All attached players are served by a single background thread and event loop,
+    instead of one thread and loop per player, and each player gets a distinct
+    `org.mpris.MediaPlayer2.<name>.instance<pid>_<n>` bus name.
+
+    Each player keeps its own bus connection: MPRIS clients attribute the
+    PropertiesChanged and Seeked signals to a player through the unique name of the
+    sending connection, so players sharing one connection would receive each
+    other's signals.
+
+    Example usage:
+        ```python
+        manager = MprisBusManager()
+        zones = [SendspinMpris(client, name="Sendspin", bus_manager=manager) for client in clients]
+        for zone in zones:
+            zone.start()
+
+        # Later
+        for zone in zones:
+            zone.stop()
+        manager.close()
+        ```
+    """
+
+    _lock: threading.Lock
+    _thread: threading.Thread | None
+    _loop: asyncio.AbstractEventLoop | None
+    _services: dict[PatchedMprisService, Callable[[], None] | None]
+    _detaching: set[concurrent.futures.Future[None]]
+    _counter: itertools.count[int]
+
+    def __init__(self) -> None:
+        """Initialize the bus manager."""
+        self._lock = threading.Lock()
+        self._thread = None
+        self._loop = None
+        self._services = {}
+        self._detaching = set()
+        self._counter = itertools.count(1)
+
+    def bus_name(self, name: str) -> str:
+        """Return a new, process-unique MPRIS bus name for a player called `name`."""
+        return f"{_MPRIS_BUS_NAME_PREFIX}.{name}.instance{os.getpid()}_{next(self._counter)}"
+
+    def attach(
+        self,
+        service: PatchedMprisService,
+        on_close: Callable[[], None] | None = None,
+    ) -> concurrent.futures.Future[RequestNameReply | None]:
+        """Start a service on the shared dispatcher.
+
+        Args:
+            service: The service to start.
+            on_close: Called from the thread calling `close()` when the manager is
+                closed while the service is still attached.
+
+        Returns:
+            A future that completes once the service is connected and exported, with
+            the reply to its bus name request.
+
+        """
+        loop = self._ensure_running()
+        with self._lock:
+            self._services[service] = on_close
+        future = asyncio.run_coroutine_threadsafe(service.async_start(), loop)
+        future.add_done_callback(self._on_attached)
+        return future
+
+    def detach(self, service: PatchedMprisService) -> concurrent.futures.Future[None]:
+        """Stop a service running on the shared dispatcher.
+
+        Returns a future that completes once the service released its bus name and
+        disconnected.
+        """
+        with self._lock:
+            _ = self._services.pop(service, None)
+            loop = self._loop
+            if loop is not None and not loop.is_closed():
+                future = asyncio.run_coroutine_threadsafe(service.async_stop(), loop)
+                self._detaching.add(future)
+                future.add_done_callback(self._detaching.discard)
+                return future
+        future = concurrent.futures.Future[None]()
+        future.set_result(None)
+        return future
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop all attached services and the dispatcher thread.
+
+        Waits for the attached services, and for services still being detached, to
+        release their bus names and disconnect, then cancels whatever is left on the
+        dispatcher. The `on_close` callbacks of services that were still attached are
+        called afterwards.
+
+        Args:
+            timeout: Seconds to wait for the services to stop.
+
+        """
+        with self._lock:
+            services = dict(self._services)
+            self._services.clear()
+            detaching = list(self._detaching)
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+
+        if loop is None or thread is None:
+            return
+        if thread is threading.current_thread():
+            raise RuntimeError("MprisBusManager cannot be closed from its dispatcher thread")
+
+        stopping = asyncio.run_coroutine_threadsafe(
+            self._stop_services(list(services), detaching), loop
+        )
+        try:
+            stopping.result(timeout)
+        except TimeoutError:
+            _LOGGER.warning("Timed out stopping MPRIS services after %ss", timeout)
+        finally:
+            _ = loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+
+        for on_close in services.values():
+            if on_close is None:
+                continue
+            try:
+                on_close()
+            except Exception:
+                _LOGGER.debug("Error in MPRIS bus manager close callback", exc_info=True)
+
+    @staticmethod
+    async def _stop_services(
+        services: list[PatchedMprisService],
+        detaching: list[concurrent.futures.Future[None]],
+    ) -> None:
+        results = await asyncio.gather(
+            *(service.async_stop() for service in services),
+            *(asyncio.wrap_future(future) for future in detaching),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.debug("Error stopping MPRIS service", exc_info=result)
+
+    def _ensure_running(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is not None:
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=self._run, args=(loop,), daemon=True, name=self.__class__.__name__
+            )
+            self._loop, self._thread = loop, thread
+            thread.start()
+            return loop
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            # Cancel and await whatever is left, e.g. services whose stop timed out
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                _ = task.cancel()
+            _ = loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    @staticmethod
+    def _on_attached(future: concurrent.futures.Future[RequestNameReply | None]) -> None:
+        if not future.cancelled() and (err := future.exception()) is not None:
+            _LOGGER.warning("Failed to start MPRIS service: %s", err)
@@ -0,0 +1,253 @@
+"""Outbound queue for Sendspin group commands issued through MPRIS."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, cast
+
+from aiosendspin.models.types import MediaCommand
+
+if TYPE_CHECKING:
+    from aiosendspin.client import SendspinClient
+
+    from .metrics import MprisMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+# Absolute seek, only defined by aiosendspin releases whose client can send a position
+SEEK_COMMAND = cast("MediaCommand | None", getattr(MediaCommand, "SEEK", None))
+
+# Commands carrying a value where only the latest one matters
+COALESCED_COMMANDS = frozenset(
+    {MediaCommand.VOLUME, MediaCommand.MUTE} | ({SEEK_COMMAND} if SEEK_COMMAND else set())
+)
+
+# Commands changing the transport state; while waiting to be sent, a newer one wins
+TRANSPORT_COMMANDS = frozenset(
+    {
+        MediaCommand.PLAY,
+        MediaCommand.PAUSE,
+        MediaCommand.STOP,
+        MediaCommand.NEXT,
+        MediaCommand.PREVIOUS,
+    }
+)
+
+
+async def _send_seek(client: SendspinClient, position_ms: int) -> None:
+    """Send an absolute seek to `position_ms`.
+
+    send_group_command() only accepts a position in aiosendspin releases defining
+    SEEK_COMMAND, so the call is checked against SEEK_COMMAND at runtime rather than
+    against whichever release the type checker sees.
+    """
+    if SEEK_COMMAND is None:
+        raise RuntimeError("This aiosendspin release cannot send seek commands")
+    send = cast("Callable[..., Awaitable[None]]", client.send_group_command)
+    await send(SEEK_COMMAND, position_ms=position_ms)
+
+
+@dataclass(frozen=True, slots=True)
+class _Command:
+    """A command waiting to be sent, with the time.perf_counter() it was issued at."""
+
+    command: MediaCommand
+    volume: int | None
+    mute: bool | None
+    position_ms: int | None
+    dispatched_at: float
+
+
+class CommandQueue:
+    """Send MPRIS-originated commands to the Sendspin server.
+
+    Volume, mute and seek commands are coalesced: while one is waiting to be sent, a
+    newer value replaces it, at most `max_rate` of each are sent per second, and the
+    final value is always delivered, so scrubbing through a track only sends a few
+    seeks. All other commands are sent immediately.
+
+    Every command being sent is tracked until it completes or `timeout` expires, and
+    at most `max_in_flight` are outstanding at once. Beyond that, commands wait for a
+    free slot: a waiting transport command (play, pause, stop, next, previous) is
+    replaced by any newer one, and any other waiting command by a newer one of the
+    same kind, so a slow or hung server cannot make commands pile up.
+
+    All methods must be called from the event loop thread.
+    """
+
+    _client: SendspinClient
+    _loop: asyncio.AbstractEventLoop
+    _interval: float
+    _timeout: float
+    _max_in_flight: int
+    _on_submit: Callable[[MediaCommand, int | None, bool | None, int | None], None] | None
+    _metrics: MprisMetrics | None
+    _pending: dict[MediaCommand, _Command]
+    _last_sent: dict[MediaCommand, float]
+    _handles: dict[MediaCommand, asyncio.TimerHandle]
+    _in_flight: dict[asyncio.Task[None], _Command]
+    _waiting: dict[object, _Command]
+
+    def __init__(  # noqa: PLR0913
+        self,
+        client: SendspinClient,
+        loop: asyncio.AbstractEventLoop,
+        *,
+        max_rate: float = 10.0,
+        timeout: float = 5.0,
+        max_in_flight: int = 8,
+        on_submit: Callable[[MediaCommand, int | None, bool | None, int | None], None]
+        | None = None,
+        metrics: MprisMetrics | None = None,
+    ) -> None:
+        """Initialize the command queue.
+
+        Args:
+            client: SendspinClient used to send the commands.
+            loop: Event loop the client runs on.
+            max_rate: Maximum number of volume (and of mute, and of seek) commands sent
+                per second.
+            timeout: Seconds after which sending a command is abandoned.
+            max_in_flight: Maximum number of commands being sent at the same time.
+            on_submit: Called with each submitted command and its arguments, before
+                any coalescing.
+            metrics: Metrics recording dispatched, coalesced and failed commands and
+                their latency, or None.
+
+        """
+        self._client = client
+        self._loop = loop
+        self._interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self._timeout = timeout
+        self._max_in_flight = max(1, max_in_flight)
+        self._on_submit = on_submit
+        self._metrics = metrics
+        self._pending = {}
+        self._last_sent = {}
+        self._handles = {}
+        self._in_flight = {}
+        self._waiting = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of commands currently being sent."""
+        return len(self._in_flight)
+
+    def submit(
+        self,
+        command: MediaCommand,
+        *,
+        volume: int | None = None,
+        mute: bool | None = None,
+        position_ms: int | None = None,
+        dispatched_at: float | None = None,
+    ) -> None:
+        """Queue a command for sending.
+
+        `dispatched_at` is the time.perf_counter() value of when the command was
+        issued, if earlier than this call; it is used to measure command latency.
+        """
+        entry = _Command(
+            command,
+            volume,
+            mute,
+            position_ms,
+            dispatched_at if dispatched_at is not None else time.perf_counter(),
+        )
+        if self._metrics is not None:
+            self._metrics.increment("mpris_commands_dispatched", command.value)
+        if self._on_submit is not None:
+            self._on_submit(command, volume, mute, position_ms)
+
+        if command not in COALESCED_COMMANDS:
+            self._send(entry)
+            return
+
+        if command in self._pending:
+            self._record_coalesced(command)
+        self._pending[command] = entry
+        if command in self._handles:
+            return
+
+        delay = self._last_sent.get(command, float("-inf")) + self._interval - self._loop.time()
+        if delay <= 0:
+            self._send_pending(command)
+        else:
+            self._handles[command] = self._loop.call_later(delay, self._send_pending, command)
+
+    def cancel(self) -> None:
+        """Drop all commands that are not being sent yet."""
+        for handle in self._handles.values():
+            handle.cancel()
+        self._handles.clear()
+        self._pending.clear()
+        self._waiting.clear()
+
+    def _send_pending(self, command: MediaCommand) -> None:
+        """Send the latest pending value of a coalesced command."""
+        _ = self._handles.pop(command, None)
+        entry = self._pending.pop(command, None)
+        if entry is None:
+            return
+
+        self._last_sent[command] = self._loop.time()
+        self._send(entry)
+
+    def _send(self, entry: _Command) -> None:
+        """Send a command now, or hold it back while too many are in flight."""
+        if len(self._in_flight) < self._max_in_flight:
+            self._start(entry)
+            return
+
+        key = "transport" if entry.command in TRANSPORT_COMMANDS else entry.command
+        replaced = self._waiting.pop(key, None)
+        if replaced is not None:
+            self._record_coalesced(replaced.command)
+        self._waiting[key] = entry
+
+    def _start(self, entry: _Command) -> None:
+        task = self._loop.create_task(self._send_with_timeout(entry))
+        self._in_flight[task] = entry
+        task.add_done_callback(self._on_sent)
+
+    async def _send_with_timeout(self, entry: _Command) -> None:
+        async with asyncio.timeout(self._timeout):
+            if entry.position_ms is None:
+                await self._client.send_group_command(
+                    entry.command, volume=entry.volume, mute=entry.mute
+                )
+            else:
+                await _send_seek(self._client, entry.position_ms)
+
+    def _on_sent(self, task: asyncio.Task[None]) -> None:
+        entry = self._in_flight.pop(task)
+        if not task.cancelled():
+            self._record_result(entry, task.exception())
+
+        while self._waiting and len(self._in_flight) < self._max_in_flight:
+            self._start(self._waiting.pop(next(iter(self._waiting))))
+
+    def _record_result(self, entry: _Command, err: BaseException | None) -> None:
+        if isinstance(err, TimeoutError):
+            _LOGGER.warning(
+                "MPRIS command %s not sent within %.1f s", entry.command.value, self._timeout
+            )
+        elif err is not None:
+            _LOGGER.warning("Failed to send MPRIS command %s: %s", entry.command.value, err)
+
+        if self._metrics is None:
+            return
+        if err is not None:
+            self._metrics.increment("mpris_commands_failed", entry.command.value)
+        else:
+            self._metrics.observe(
+                "mpris_command_latency_seconds", time.perf_counter() - entry.dispatched_at
+            )
+
+    def _record_coalesced(self, command: MediaCommand) -> None:
+        if self._metrics is not None:
+            self._metrics.increment("mpris_commands_coalesced", command.value)
@@ -0,0 +1,95 @@
+"""Coalescing scheduler for MPRIS property change emission."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable
+
+
+class EmissionScheduler:
+    """Collect dirty MPRIS properties and flush them as one merged signal.
+
+    Properties marked dirty are held until `window` seconds have passed without a new
+    mark, or until the end of the current event loop iteration when `window` is zero.
+    A batch is never held longer than `max_delay` seconds after its first mark, so
+    a continuous stream of updates cannot starve the desktop of state changes.
+    """
+
+    _loop: asyncio.AbstractEventLoop
+    _flush_callback: Callable[[set[str]], None]
+    _window: float
+    _max_delay: float
+    _dirty: set[str]
+    _deadline: float | None
+    _handle: asyncio.Handle | None
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        flush_callback: Callable[[set[str]], None],
+        *,
+        window: float = 0.0,
+        max_delay: float = 0.005,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            loop: Event loop the scheduler runs on.
+            flush_callback: Called with the merged set of dirty property names.
+            window: Seconds to wait for further changes before flushing.
+            max_delay: Upper bound, in seconds, between the first change and the flush.
+
+        """
+        self._loop = loop
+        self._flush_callback = flush_callback
+        self._window = max(0.0, window)
+        self._max_delay = max(0.0, max_delay)
+        self._dirty = set()
+        self._deadline = None
+        self._handle = None
+
+    @property
+    def pending(self) -> bool:
+        """Return whether there are dirty properties waiting to be flushed."""
+        return bool(self._dirty)
+
+    def mark(self, properties: Iterable[str]) -> None:
+        """Mark properties as dirty and schedule a flush."""
+        self._dirty.update(properties)
+        if not self._dirty:
+            return
+
+        now = self._loop.time()
+        if self._deadline is None:
+            self._deadline = now + self._max_delay
+
+        if self._window <= 0.0:
+            if self._handle is None:
+                self._handle = self._loop.call_soon(self.flush)
+            return
+
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = self._loop.call_at(min(now + self._window, self._deadline), self.flush)
+
+    def flush(self) -> None:
+        """Emit all dirty properties now."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._deadline = None
+
+        if not self._dirty:
+            return
+
+        dirty = self._dirty
+        self._dirty = set()
+        self._flush_callback(dirty)
+
+    def cancel(self) -> None:
+        """Drop all dirty properties without emitting them."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._deadline = None
+        self._dirty.clear()
@@ -0,0 +1,186 @@
+"""Counters and latency histograms for the MPRIS integration."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from dataclasses import dataclass, field
+
+# Counter families, with the name of their label and their help text
+COUNTERS: dict[str, tuple[str, str]] = {
+    "mpris_callbacks": ("type", "Client listener callbacks received"),
+    "mpris_updates_suppressed": (
+        "change",
+        "State updates that changed nothing and emitted nothing",
+    ),
+    "mpris_properties_emitted": ("property", "Player properties announced with PropertiesChanged"),
+    "mpris_signals_emitted": ("signal", "D-Bus signals emitted"),
+    "mpris_property_reads": ("property", "D-Bus Properties.Get calls"),
+    "mpris_property_read_alls": ("interface", "D-Bus Properties.GetAll calls"),
+    "mpris_commands_dispatched": ("command", "Commands issued through MPRIS"),
+    "mpris_commands_coalesced": ("command", "Commands replaced by a newer one before being sent"),
+    "mpris_commands_failed": ("command", "Commands the client failed to send"),
+}
+
+# Histogram families and their help text
+HISTOGRAMS: dict[str, str] = {
+    "mpris_command_latency_seconds": (
+        "Time from an MPRIS command call to the completion of send_group_command"
+    ),
+    "mpris_update_latency_seconds": (
+        "Time from a server update to the emission of the signal announcing it"
+    ),
+}
+
+# Upper bounds, in seconds, of the histogram buckets
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+@dataclass(slots=True)
+class _Histogram:
+    """Bucketed observations of one histogram family."""
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    total: float = 0.0
+    count: int = 0
+
+
+class MprisMetrics:
+    """Optional instrumentation of a SendspinMpris instance.
+
+    Counts listener callbacks, emitted and suppressed updates, D-Bus property reads and
+    commands, and records the latency of commands and of server updates reaching the
+    desktop. Pass an instance to SendspinMpris to collect them, and read them with
+    snapshot() or render_openmetrics().
+
+    Recording is thread-safe, since D-Bus calls may be served from the service thread.
+
+    Example usage:
+        ```python
+        metrics = MprisMetrics()
+        mpris = SendspinMpris(client, metrics=metrics)
+        ...
+        print(metrics.render_openmetrics())
+        ```
+    """
+
+    _lock: threading.Lock
+    _counters: dict[str, dict[str, int]]
+    _histograms: dict[str, _Histogram]
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self._lock = threading.Lock()
+        self._counters = {name: {} for name in COUNTERS}
+        self._histograms = {name: _Histogram() for name in HISTOGRAMS}
+
+    def increment(self, name: str, label: str, amount: int = 1) -> None:
+        """Add `amount` to the counter `name` for the label value `label`."""
+        with self._lock:
+            counter = self._counters[name]
+            counter[label] = counter.get(label, 0) + amount
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a duration in the histogram `name`."""
+        index = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            histogram = self._histograms[name]
+            histogram.counts[index] += 1
+            histogram.total += seconds
+            histogram.count += 1
+
+    def reset(self) -> None:
+        """Reset all counters and histograms."""
+        with self._lock:
+            self._counters = {name: {} for name in COUNTERS}
+            self._histograms = {name: _Histogram() for name in HISTOGRAMS}
+
+    def snapshot(self) -> dict[str, dict[str, object]]:
+        """Return a copy of all metrics as plain, JSON-serializable dicts.
+
+        Counters map each label value to its count. Histograms hold their observation
+        count and sum, and the cumulative count of each bucket keyed by its upper bound.
+        """
+        counters, histograms = self._copy()
+        return {
+            "counters": dict(counters),
+            "histograms": {
+                name: {
+                    "count": histogram.count,
+                    "sum": histogram.total,
+                    "buckets": dict(_cumulative_buckets(histogram)),
+                }
+                for name, histogram in histograms.items()
+            },
+        }
+
+    def render_openmetrics(self) -> str:
+        """Return all metrics in the OpenMetrics text exposition format."""
+        counters, histograms = self._copy()
+        lines: list[str] = []
+
+        for name, (label_name, help_text) in COUNTERS.items():
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"# HELP {name} {help_text}.")
+            lines.extend(
+                f'{name}_total{{{label_name}="{_escape(label)}"}} {value}'
+                for label, value in sorted(counters[name].items())
+            )
+
+        for name, help_text in HISTOGRAMS.items():
+            histogram = histograms[name]
+            lines.append(f"# TYPE {name} histogram")
+            lines.append(f"# UNIT {name} seconds")
+            lines.append(f"# HELP {name} {help_text}.")
+            lines.extend(
+                f'{name}_bucket{{le="{bound}"}} {count}'
+                for bound, count in _cumulative_buckets(histogram)
+            )
+            lines.append(f"{name}_sum {histogram.total}")
+            lines.append(f"{name}_count {histogram.count}")
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def _copy(self) -> tuple[dict[str, dict[str, int]], dict[str, _Histogram]]:
+        """Return a consistent copy of all counters and histograms."""
+        with self._lock:
+            counters = {name: dict(values) for name, values in self._counters.items()}
+            histograms = {
+                name: _Histogram(list(histogram.counts), histogram.total, histogram.count)
+                for name, histogram in self._histograms.items()
+            }
+        return counters, histograms
+
+
+def _cumulative_buckets(histogram: _Histogram) -> list[tuple[str, int]]:
+    """Return the upper bound and cumulative count of each bucket of a histogram."""
+    buckets: list[tuple[str, int]] = []
+    cumulative = 0
+    bounds = (*map(str, LATENCY_BUCKETS), "+Inf")
+    for bound, count in zip(bounds, histogram.counts, strict=True):
+        cumulative += count
+        buckets.append((bound, cumulative))
+    return buckets
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the OpenMetrics text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
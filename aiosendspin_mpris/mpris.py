@@ -3,34 +3,136 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import importlib.util
 import logging
+import sys
+import time
 from collections.abc import Callable
-from typing import TYPE_CHECKING
-
-from .adapter import (
-    MPRIS_AVAILABLE,
-    MprisState,
-    SendspinMprisAdapterPlayer,
-    SendspinMprisAdapterPlaylists,
-    SendspinMprisAdapterRoot,
-    SendspinMprisAdapterTrackList,
-)
+from functools import cache, partial
+from operator import attrgetter
+from typing import TYPE_CHECKING, Unpack, cast
+
+from aiosendspin.models.types import MediaCommand, PlaybackStateType, UndefinedField
+
+from .commands import SEEK_COMMAND, CommandQueue
+from .emission import EmissionScheduler
+from .optimistic import OptimisticOverlay
+from .state import PLAYER_PROPERTIES, MprisStateTracker, track_identity
 
 if TYPE_CHECKING:
     from aiosendspin.client import SendspinClient
     from aiosendspin.models.core import GroupUpdateServerPayload, ServerStatePayload
-    from aiosendspin.models.types import MediaCommand, PlaybackStateType
-    from mpris_api.MprisService import MprisService
-    from mpris_api.MprisUpdateNotifier import MprisUpdateNotifier
+    from aiosendspin.models.metadata import Progress, SessionUpdateMetadata
+    from dbus_next.constants import RequestNameReply
+
+    from .adapter import (
+        SendspinMprisAdapterPlayer,
+        SendspinMprisAdapterPlaylists,
+        SendspinMprisAdapterRoot,
+        SendspinMprisAdapterTrackList,
+    )
+    from .artwork import ArtworkCache
+    from .bus import MprisBusManager
+    from .metrics import MprisMetrics
+    from .mpris_service import PatchedMprisService
+    from .state import MprisState, StateUpdate
 
 
 _LOGGER = logging.getLogger(__name__)
 
+# MPRIS is only available on Linux with mpris_api installed. The package is only
+# looked up here; it is imported when the MPRIS service is first started.
+MPRIS_AVAILABLE = sys.platform == "linux" and importlib.util.find_spec("mpris_api") is not None
+
+# Playback state each transport command is expected to produce
+_COMMAND_PLAYBACK_STATES: dict[MediaCommand, PlaybackStateType] = {
+    MediaCommand.PLAY: PlaybackStateType.PLAYING,
+    MediaCommand.PAUSE: PlaybackStateType.PAUSED,
+    MediaCommand.STOP: PlaybackStateType.STOPPED,
+}
+
+# Public state setters, replaced by no-ops when MPRIS can never be published
+_STATE_SETTERS = (
+    "apply",
+    "set_metadata",
+    "set_artwork",
+    "set_progress",
+    "set_playback_state",
+    "set_volume",
+    "set_supported_commands",
+)
+
+# Seconds after which downloading the artwork from the server is abandoned
+_ARTWORK_FETCH_TIMEOUT = 10.0
+
+# SessionUpdateMetadata fields copied into the MprisState fields of the same name
+_METADATA_FIELDS = ("title", "artist", "album")
+_get_metadata_fields = attrgetter(*_METADATA_FIELDS, "progress")
+
+
+def _merge_metadata(metadata: SessionUpdateMetadata) -> dict[str, object]:
+    """Return the MprisState changes carried by a metadata update.
+
+    Fields left undefined in the update are skipped, so they keep their current value.
+    Progress fields are only included when the server reported progress.
+    """
+    *values, progress = cast("tuple[object, ...]", _get_metadata_fields(metadata))
+    changes = {
+        name: value
+        for name, value in zip(_METADATA_FIELDS, values, strict=True)
+        if not isinstance(value, UndefinedField)
+    }
+    if progress is None or isinstance(progress, UndefinedField):
+        return changes
+
+    progress = cast("Progress", progress)
+    changes["duration_ms"] = progress.track_duration
+    changes["progress_ms"] = progress.track_progress
+    changes["playback_rate"] = progress.playback_speed / 1000
+    return changes
+
+
+def _add_track_id(state: MprisState, changes: dict[str, object]) -> bool:
+    """Add the track identity to metadata changes describing another track.
+
+    Returns:
+        Whether the changes start a new track.
+
+    """
+    current = (state.title, state.artist, state.album, state.duration_ms)
+    track = (
+        changes.get("title", state.title),
+        changes.get("artist", state.artist),
+        changes.get("album", state.album),
+        changes.get("duration_ms", state.duration_ms),
+    )
+    if track == current:
+        return False
+    changes["track_id"] = track_identity(*track)
+    return True
+
+
+def _ignore_update(*_args: object, **_kwargs: object) -> None:
+    """Stand in for a state setter while MPRIS is disabled."""
+
+
+@cache
+def _log_disabled(reason: str) -> None:
+    """Log, once per process and reason, that MPRIS updates are ignored."""
+    _LOGGER.info("MPRIS disabled (%s); state updates are ignored", reason)
+
 
 class SendspinMpris:
     """MPRIS integration for aiosendspin applications.
 
     Provides desktop media control integration on Linux systems, using MPRIS.
+    Elsewhere, without mpris_api, or once starting it finds no session bus (e.g. in
+    a container), the instance is disabled: the set_*() methods are no-ops, so
+    callers need no checks of their own. Without MPRIS, starting it does nothing;
+    without a session bus, calling start() or async_start() again looks for one anew,
+    e.g. once a user bus that started late is available. State updates made while the
+    instance was disabled are not kept.
 
     When started, this class automatically registers listeners on the provided
     SendspinClient to update MPRIS state when metadata, playback state, or volume
@@ -44,6 +146,8 @@ class SendspinMpris:
         client = SendspinClient(...)
         mpris = SendspinMpris(client)
         mpris.start()  # Starts MPRIS and attaches listeners to client
+        # or, to run the D-Bus service on the current event loop instead of a thread:
+        # await mpris.async_start()
 
         # Later
         mpris.stop()
@@ -54,18 +158,63 @@ class SendspinMpris:
     _name: str
     _desktop_entry: str | None
     _loop: asyncio.AbstractEventLoop | None
-    _state: MprisState
+    _tracker: MprisStateTracker
     _adapter_root: SendspinMprisAdapterRoot | None
     _adapter_player: SendspinMprisAdapterPlayer | None
     _adapter_tracklist: SendspinMprisAdapterTrackList | None
     _adapter_playlists: SendspinMprisAdapterPlaylists | None
-    _service: MprisService | None
-    _update_notifier: MprisUpdateNotifier | None
+    _service: PatchedMprisService | None
+    _commands: CommandQueue | None
+    _emit_window: float
+    _emit_max_delay: float
+    _seek_threshold_ms: int
+    _volume_rate_limit: float
+    _command_timeout: float
+    _max_commands_in_flight: int
+    _optimistic_timeout: float | None
+    _reconnect_delay: float
+    _reconnect_max_delay: float
+    _start_timeout: float
+    _stop_timeout: float
+    _bus_manager: MprisBusManager | None
+    _metrics: MprisMetrics | None
+    _artwork_cache: ArtworkCache | None
+    _artwork_source: str | bytes | None
+    _artwork_task: asyncio.Task[None] | None
+    _seek_deadline_ns: int | None
+    _update_received_at: float | None
+    _batch_received_at: float | None
+    _scheduler: EmissionScheduler | None
+    _overlay: OptimisticOverlay | None
     _running: bool
+    _disabled: bool
+    _bus_missing: bool
+    _log_start_on_connect: bool
+    _connected: bool
+    _connection_count: int
+    _connection_listeners: list[Callable[[bool], None]]
     _listener_removers: list[Callable[[], None]]
 
-    def __init__(
-        self, client: SendspinClient, name: str = "Sendspin", desktop_entry: str | None = None
+    def __init__(  # noqa: PLR0913
+        self,
+        client: SendspinClient,
+        name: str = "Sendspin",
+        desktop_entry: str | None = None,
+        *,
+        emit_window: float = 0.0,
+        emit_max_delay: float = 0.005,
+        seek_threshold_ms: int = 1000,
+        volume_rate_limit: float = 10.0,
+        command_timeout: float = 5.0,
+        max_commands_in_flight: int = 8,
+        optimistic_timeout: float | None = None,
+        reconnect_delay: float = 1.0,
+        reconnect_max_delay: float = 60.0,
+        start_timeout: float = 10.0,
+        stop_timeout: float = 5.0,
+        bus_manager: MprisBusManager | None = None,
+        metrics: MprisMetrics | None = None,
+        artwork_cache: ArtworkCache | None = None,
     ) -> None:
         """Initialize the MPRIS interface.
 
@@ -73,43 +222,276 @@ class SendspinMpris:
             client: SendspinClient instance for sending commands and receiving state updates.
             name: Application name shown in MPRIS (default: "Sendspin").
             desktop_entry: The .desktop file name, with the '.desktop' extension stripped, or None.
+            emit_window: Seconds to collect property changes before emitting one merged
+                PropertiesChanged signal (default: 0.0, i.e. until the end of the current
+                event loop iteration).
+            emit_max_delay: Maximum seconds a property change may be held back before it
+                is emitted, regardless of emit_window (default: 0.005).
+            seek_threshold_ms: Minimum difference between a reported progress and the
+                extrapolated position for it to be announced with the MPRIS Seeked
+                signal, and maximum difference for it to confirm a seek issued through
+                MPRIS (default: 1000).
+            volume_rate_limit: Maximum number of volume (and of mute, and of seek)
+                commands sent to the server per second. Intermediate values, e.g. from
+                dragging a volume slider or scrubbing through a track, are dropped in
+                favor of the latest one (default: 10.0).
+            command_timeout: Seconds after which sending a command to the server is
+                abandoned and logged as failed (default: 5.0).
+            max_commands_in_flight: Maximum number of commands being sent to the server
+                at the same time. Further commands wait, and a waiting play/pause/stop/
+                next/previous command is replaced by a newer one (default: 8).
+            optimistic_timeout: If set, play/pause/stop and volume/mute commands issued
+                through MPRIS are applied to the local state right away, and rolled back
+                if the server does not confirm them within this many seconds
+                (default: None, disabled).
+            reconnect_delay: Seconds to wait before the first attempt to reconnect to
+                the session bus after losing the connection; doubled after every failed
+                attempt, with random jitter (default: 1.0).
+            reconnect_max_delay: Upper bound, in seconds, of the delay between two
+                reconnection attempts (default: 60.0).
+            start_timeout: Seconds async_start() waits for the service to be exported
+                and its bus name requested before giving up (default: 10.0).
+            stop_timeout: Seconds async_stop(), and stop() with a bus manager, wait for
+                the bus name to be released and the connection closed (default: 5.0).
+            bus_manager: If set, the D-Bus service runs on this shared dispatcher,
+                together with the other instances using it, under a bus name unique
+                to this instance (default: None, run a dedicated service).
+            metrics: If set, counters and latency histograms of this instance are
+                recorded into it (default: None).
+            artwork_cache: If set, the artwork of the current track is stored in this
+                cache and published as a local `file://` URL. Otherwise the artwork URL
+                sent by the server is published as is, and artwork images passed to
+                set_artwork() are ignored (default: None).
 
         """
         self._client = client
         self._name = name
         self._desktop_entry = desktop_entry
+        self._emit_window = emit_window
+        self._emit_max_delay = emit_max_delay
+        self._seek_threshold_ms = seek_threshold_ms
+        self._volume_rate_limit = volume_rate_limit
+        self._command_timeout = command_timeout
+        self._max_commands_in_flight = max_commands_in_flight
+        self._optimistic_timeout = optimistic_timeout
+        self._reconnect_delay = reconnect_delay
+        self._reconnect_max_delay = reconnect_max_delay
+        self._start_timeout = start_timeout
+        self._stop_timeout = stop_timeout
+        self._bus_manager = bus_manager
+        self._metrics = metrics
+        self._artwork_cache = artwork_cache
+        self._artwork_source = None
+        self._artwork_task = None
+        self._seek_deadline_ns = None
+        self._update_received_at = None
+        self._batch_received_at = None
         self._loop = None
 
-        self._state = MprisState()
+        self._tracker = MprisStateTracker()
 
         self._adapter_root = None
         self._adapter_player = None
         self._adapter_tracklist = None
         self._adapter_playlists = None
         self._service = None
-        self._update_notifier = None
+        self._commands = None
+        self._scheduler = None
+        self._overlay = None
         self._running = False
+        self._disabled = False
+        self._bus_missing = False
+        self._log_start_on_connect = False
+        self._connected = False
+        self._connection_count = 0
+        self._connection_listeners = []
         self._listener_removers = []
 
+        if not MPRIS_AVAILABLE:
+            _log_disabled("not on Linux or mpris_api not installed")
+            self._disable()
+
+    def _disable(self) -> None:
+        """Replace the state setters with no-ops, as their updates can never be published.
+
+        This is decided on start, so each ignored update costs a single attribute
+        lookup.
+        """
+        self._disabled = True
+        for name in _STATE_SETTERS:
+            setattr(self, name, _ignore_update)
+
+    def _enable(self) -> None:
+        """Restore the state setters replaced by _disable()."""
+        self._disabled = self._bus_missing = False
+        for name in _STATE_SETTERS:
+            with contextlib.suppress(AttributeError):
+                delattr(self, name)
+
+    @property
+    def metrics(self) -> MprisMetrics | None:
+        """Return the metrics recorded for this instance, if enabled."""
+        return self._metrics
+
+    @property
+    def connected(self) -> bool:
+        """Return whether the MPRIS service is currently connected to the session bus."""
+        return self._connected
+
+    def add_connection_listener(self, callback: Callable[[bool], None]) -> Callable[[], None]:
+        """Register a callback for D-Bus connection state changes.
+
+        The callback is called on the event loop with True whenever the service
+        (re)connects to the session bus and with False whenever it loses the
+        connection, e.g. to monitor connection flapping.
+
+        Returns:
+            Function that removes the callback again.
+
+        """
+        self._connection_listeners.append(callback)
+        return partial(self._remove_connection_listener, callback)
+
+    def _remove_connection_listener(self, callback: Callable[[bool], None]) -> None:
+        with contextlib.suppress(ValueError):
+            self._connection_listeners.remove(callback)
+
     def start(self) -> None:
         """Start the MPRIS D-Bus service and attach listeners to the client.
 
-        This creates a background thread that runs the MPRIS server and registers
+        This creates a background thread that runs the MPRIS server (or uses the
+        shared dispatcher of the bus manager, if one was given) and registers
         listeners on the client to automatically update MPRIS state when metadata,
         playback state, or volume changes are received from the server.
 
+        If MPRIS is not available (not on Linux or mpris_api not installed),
+        this method does nothing. If no session bus is found, the instance is
+        disabled until the next start.
+        """
+        service = self._create_service()
+        if service is None:
+            return
+
+        if self._bus_manager is not None:
+            _ = self._bus_manager.attach(service, self._on_bus_closed)
+        else:
+            service.start()
+        self._activate()
+        # The connection is made in the background, and may find no session bus
+        self._log_start_on_connect = True
+
+    async def async_start(self) -> RequestNameReply | None:
+        """Start the MPRIS D-Bus service on the running event loop.
+
+        Unlike start(), no background thread is created: the D-Bus connection is
+        made and the interfaces are exported on the caller's event loop, so MPRIS
+        method calls reach the client without crossing threads. With a bus manager,
+        this waits until the service is exported on the shared dispatcher.
+
+        This returns once the bus name is requested. Anything but PRIMARY_OWNER (or
+        ALREADY_OWNER) means another connection, e.g. a previous instance that did
+        not stop yet, still owns the name; this instance is queued to take it over.
+
         If MPRIS is not available (not on Linux or mpris_api not installed),
         this method does nothing.
+
+        Returns:
+            The reply of the session bus to the bus name request, or None if MPRIS or
+            the session bus is not available; the instance is then not started. If the
+            instance is already running, the reply to its earlier request is returned,
+            which is None while a start() in the background has not requested the name.
+
+        Raises:
+            TimeoutError: If the service was not started within `start_timeout`; it
+                is then stopped again, as on any other error.
+
         """
-        if not MPRIS_AVAILABLE:
-            _LOGGER.debug("MPRIS not available: mpris_api package not installed or not on Linux")
+        if self._running and self._service is not None:
+            _LOGGER.debug("MPRIS interface already running")
+            return self._service.name_reply
+
+        service = self._create_service()
+        if service is None:
+            return None
+
+        try:
+            async with asyncio.timeout(self._start_timeout):
+                if self._bus_manager is not None:
+                    reply = await asyncio.wrap_future(
+                        self._bus_manager.attach(service, self._on_bus_closed)
+                    )
+                else:
+                    reply = await service.async_start()
+        except BaseException as err:
+            if isinstance(err, TimeoutError):
+                _LOGGER.warning("MPRIS service not started within %.1f s", self._start_timeout)
+            self._stop_service(self._release_service())
+            raise
+
+        if reply is None:
+            # Without a session bus there is nothing to supervise or publish to
+            self._stop_service(self._release_service())
+            self._disable_without_bus()
+            return None
+
+        self._activate()
+        _LOGGER.info("MPRIS interface started")
+        return reply
+
+    async def async_stop(self) -> None:
+        """Stop the MPRIS interface like stop(), and wait for the service to shut down.
+
+        The bus name is released before disconnecting from the session bus, so a
+        new instance started right after this returns gets the name immediately.
+
+        Raises:
+            TimeoutError: If the service did not shut down within `stop_timeout`.
+
+        """
+        if not self._running:
             return
 
-        from .mpris_service import PatchedMprisService
+        service = self._shutdown()
+        if service is None:
+            _LOGGER.info("MPRIS interface stopped")
+            return
+
+        try:
+            async with asyncio.timeout(self._stop_timeout):
+                if self._bus_manager is not None:
+                    await asyncio.wrap_future(self._bus_manager.detach(service))
+                else:
+                    await service.async_stop()
+        except TimeoutError:
+            _LOGGER.warning("MPRIS service not stopped within %.1f s", self._stop_timeout)
+            raise
+        _LOGGER.info("MPRIS interface stopped")
+
+    def _create_service(self) -> PatchedMprisService | None:
+        """Create the adapters and the MPRIS service, or return None if not applicable."""
+        if not MPRIS_AVAILABLE or (self._disabled and not self._bus_missing):
+            return None
 
         if self._running:
             _LOGGER.debug("MPRIS interface already running")
-            return
+            return None
+
+        if self._disabled:
+            # A session bus may have become available since the last start
+            self._enable()
+
+        try:
+            from .adapter import (
+                SendspinMprisAdapterPlayer,
+                SendspinMprisAdapterPlaylists,
+                SendspinMprisAdapterRoot,
+                SendspinMprisAdapterTrackList,
+            )
+            from .mpris_service import PatchedMprisService
+        except ImportError as err:
+            _LOGGER.warning("MPRIS not available: %s", err)
+            self._disable()
+            return None
 
         try:
             self._loop = asyncio.get_running_loop()
@@ -119,7 +501,16 @@ class SendspinMpris:
         self._adapter_root = SendspinMprisAdapterRoot(
             identity=self._name, desktop_entry=self._desktop_entry
         )
-        self._adapter_player = SendspinMprisAdapterPlayer(self._client, self._loop, self._state)
+        self._commands = CommandQueue(
+            self._client,
+            self._loop,
+            max_rate=self._volume_rate_limit,
+            timeout=self._command_timeout,
+            max_in_flight=self._max_commands_in_flight,
+            on_submit=self._on_command_submitted,
+            metrics=self._metrics,
+        )
+        self._adapter_player = SendspinMprisAdapterPlayer(self._commands, self._loop, self._tracker)
         self._adapter_tracklist = SendspinMprisAdapterTrackList()
         self._adapter_playlists = SendspinMprisAdapterPlaylists()
 
@@ -129,23 +520,51 @@ class SendspinMpris:
             adapterPlayer=self._adapter_player,
             adapterTrackList=self._adapter_tracklist,
             adapterPlayLists=self._adapter_playlists,
+            reconnect_delay=self._reconnect_delay,
+            reconnect_max_delay=self._reconnect_max_delay,
+            on_connection_change=self._on_connection_change,
+            on_unavailable=self._on_bus_unavailable,
+            metrics=self._metrics,
+            bus_name=self._bus_manager.bus_name(self._name)
+            if self._bus_manager is not None
+            else None,
+        )
+        return self._service
+
+    def _activate(self) -> None:
+        """Set up signal emission and attach client listeners once the service is up."""
+        assert self._loop is not None
+        self._scheduler = EmissionScheduler(
+            self._loop,
+            self._flush_properties,
+            window=self._emit_window,
+            max_delay=self._emit_max_delay,
         )
-        self._service.start()
-        self._update_notifier = self._service.updateNotifier
+        if self._optimistic_timeout is not None:
+            self._overlay = OptimisticOverlay(
+                self._loop, self._on_optimistic_expired, timeout=self._optimistic_timeout
+            )
 
         self._running = True
 
         self._attach_client_listeners()
-
-        _LOGGER.info("MPRIS interface started")
+        self._load_artwork()
 
     def stop(self) -> None:
         """Stop the MPRIS D-Bus service and remove client listeners."""
         if not self._running:
             return
 
+        self._stop_service(self._shutdown())
+        _LOGGER.info("MPRIS interface stopped")
+
+    def _shutdown(self) -> PatchedMprisService | None:
+        """Remove the client listeners and tear down all local state.
+
+        Returns the service, which is left for the caller to stop.
+        """
         self._running = False
-        self._update_notifier = None
+        self._log_start_on_connect = False
 
         for remover in self._listener_removers:
             try:
@@ -154,65 +573,181 @@ class SendspinMpris:
                 _LOGGER.debug("Error removing listener", exc_info=True)
         self._listener_removers.clear()
 
-        if self._service is not None:
-            try:
-                self._service.stop()
-            except Exception:
-                _LOGGER.debug("Error stopping MPRIS service", exc_info=True)
-            self._service = None
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+            self._scheduler = None
+        self._batch_received_at = None
+        self._seek_deadline_ns = None
+
+        if self._overlay is not None:
+            self._overlay.cancel()
+            self._overlay = None
+
+        self._stop_artwork()
+        return self._release_service()
+
+    def _release_service(self) -> PatchedMprisService | None:
+        """Drop the service, the command queue and the adapters, returning the service."""
+        service, self._service = self._service, None
+
+        if self._commands is not None:
+            self._commands.cancel()
+            self._commands = None
 
         self._adapter_root = None
         self._adapter_player = None
         self._adapter_tracklist = None
         self._adapter_playlists = None
+        return service
 
-        _LOGGER.info("MPRIS interface stopped")
+    def _stop_service(self, service: PatchedMprisService | None) -> None:
+        """Stop a service, waiting up to `stop_timeout` for the bus manager to detach it."""
+        if service is None:
+            return
+        try:
+            if self._bus_manager is not None:
+                self._bus_manager.detach(service).result(self._stop_timeout)
+            else:
+                service.stop()
+        except TimeoutError:
+            _LOGGER.warning("MPRIS service not stopped within %.1f s", self._stop_timeout)
+        except Exception:
+            _LOGGER.debug("Error stopping MPRIS service", exc_info=True)
+
+    def _on_bus_unavailable(self) -> None:
+        """Handle the service finding no session bus, reported from the D-Bus service thread."""
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            _ = loop.call_soon_threadsafe(self._apply_bus_unavailable, self._service)
+        except RuntimeError:
+            _LOGGER.debug("Failed to report missing session bus: event loop not available")
+
+    def _apply_bus_unavailable(self, service: PatchedMprisService | None) -> None:
+        """Stop and disable the instance, unless the service was replaced meanwhile."""
+        if service is None or service is not self._service:
+            return
+        self.stop()
+        self._disable_without_bus()
+
+    def _on_bus_closed(self) -> None:
+        """Handle the bus manager being closed while the service is attached."""
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            _ = loop.call_soon_threadsafe(self._apply_bus_closed, self._service)
+        except RuntimeError:
+            _LOGGER.debug("Failed to report closed bus manager: event loop not available")
+
+    def _apply_bus_closed(self, service: PatchedMprisService | None) -> None:
+        """Stop the instance, unless the service was replaced meanwhile."""
+        if service is None or service is not self._service:
+            return
+        self.stop()
+
+    def _disable_without_bus(self) -> None:
+        _log_disabled("no session bus")
+        self._disable()
+        self._bus_missing = True
+
+    def _on_connection_change(self, connected: bool) -> None:
+        """Handle a connection state change reported from the D-Bus service thread."""
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            _ = loop.call_soon_threadsafe(self._apply_connection_change, connected)
+        except RuntimeError:
+            _LOGGER.debug("Failed to report MPRIS connection state: event loop not available")
+
+    def _apply_connection_change(self, connected: bool) -> None:
+        """Record a connection state change and notify the connection listeners."""
+        if connected == self._connected:
+            return
+
+        self._connected = connected
+        if connected:
+            if self._log_start_on_connect:
+                self._log_start_on_connect = False
+                _LOGGER.info("MPRIS interface started")
+            self._connection_count += 1
+            # Clients may have missed changes while disconnected; announce everything
+            if self._connection_count > 1 and self._scheduler is not None:
+                self._scheduler.mark(PLAYER_PROPERTIES)
+        _LOGGER.debug("MPRIS service %s", "connected" if connected else "disconnected")
+
+        for listener in list(self._connection_listeners):
+            try:
+                listener(connected)
+            except Exception:
+                _LOGGER.debug("Error in MPRIS connection listener", exc_info=True)
 
     def _attach_client_listeners(self) -> None:
         """Attach event listeners to the client for MPRIS state updates."""
-        self._listener_removers.append(self._client.add_metadata_listener(self._on_metadata_update))
         self._listener_removers.append(
-            self._client.add_group_update_listener(self._on_group_update)
+            self._client.add_metadata_listener(
+                self._instrumented("metadata", self._on_metadata_update)
+            )
         )
         self._listener_removers.append(
-            self._client.add_controller_state_listener(self._on_controller_state)
+            self._client.add_group_update_listener(
+                self._instrumented("group_update", self._on_group_update)
+            )
+        )
+        self._listener_removers.append(
+            self._client.add_controller_state_listener(
+                self._instrumented("controller_state", self._on_controller_state)
+            )
         )
 
         _LOGGER.debug("Attached MPRIS listeners to SendspinClient")
 
+    def _instrumented[T](self, kind: str, callback: Callable[[T], None]) -> Callable[[T], None]:
+        """Wrap a client listener to count it and time the signals it causes."""
+        metrics = self._metrics
+        if metrics is None:
+            return callback
+
+        def listener(payload: T) -> None:
+            metrics.increment("mpris_callbacks", kind)
+            self._update_received_at = time.perf_counter()
+            try:
+                callback(payload)
+            finally:
+                self._update_received_at = None
+
+        return listener
+
     def _on_metadata_update(self, payload: ServerStatePayload) -> None:
         """Handle metadata updates from the client."""
-        from aiosendspin.models.types import UndefinedField
-
         metadata = payload.metadata
         if metadata is None:
             return
 
-        # Extract metadata fields
-        title = (
-            metadata.title if not isinstance(metadata.title, UndefinedField) else self._state.title
-        )
-        artist = (
-            metadata.artist
-            if not isinstance(metadata.artist, UndefinedField)
-            else self._state.artist
-        )
-        album = (
-            metadata.album if not isinstance(metadata.album, UndefinedField) else self._state.album
-        )
-
-        # Extract duration from progress if available
-        duration_ms = self._state.duration_ms
-        progress_ms = self._state.progress_ms
-
-        if not isinstance(metadata.progress, UndefinedField) and metadata.progress is not None:
-            duration_ms = metadata.progress.track_duration
-            progress_ms = metadata.progress.track_progress
+        if not isinstance(artwork_url := metadata.artwork_url, UndefinedField):
+            self.set_artwork(artwork_url)
 
-        self.set_metadata(title=title, artist=artist, album=album, duration_ms=duration_ms)
+        changes = _merge_metadata(metadata)
+        previous = self._tracker.state
+        new_track = _add_track_id(previous, changes)
+        now_ns = time.monotonic_ns()
+        seek_confirmed = "progress_ms" in changes and self._resolve_seek(
+            changes, now_ns, new_track=new_track
+        )
+        if "progress_ms" not in changes:
+            self._emit_properties(self._tracker.update(**changes), "metadata")
+            return
 
-        if progress_ms is not None:
-            self.set_progress(progress_ms)
+        # Re-anchor the position in the same snapshot as the metadata it belongs to
+        properties = self._tracker.update(progress_updated_ns=now_ns, **changes)
+        self._emit_properties(properties, "metadata")
+        if seek_confirmed:
+            self._emit_seeked(self._tracker.state.position_us(now_ns))
+        # A new track starts at its own position, which is not a seek
+        elif not new_track:
+            self._check_seeked(previous, now_ns)
 
     def _on_group_update(self, payload: GroupUpdateServerPayload) -> None:
         """Handle group update (playback state) from the client."""
@@ -227,6 +762,57 @@ class SendspinMpris:
         self.set_supported_commands(set(controller.supported_commands))
         self.set_volume(controller.volume, muted=controller.muted)
 
+    def apply(self, **fields: Unpack[StateUpdate]) -> None:
+        """Update several state fields at once.
+
+        All fields are published in one snapshot, so MPRIS clients never see a mix of
+        old and new values, and announced with a single PropertiesChanged signal,
+        instead of one per set_*() call. Fields not given keep their current value.
+
+        Example usage:
+            ```python
+            mpris.apply(
+                title="Song",
+                artist="Artist",
+                duration_ms=180_000,
+                progress_ms=0,
+                playback_state=PlaybackStateType.PLAYING,
+            )
+            ```
+        """
+        changes: dict[str, object] = dict(fields)
+        if "supported_commands" in fields:
+            changes["supported_commands"] = frozenset(fields["supported_commands"])
+        if self._overlay is not None:
+            overlay = self._overlay
+            changes = {
+                name: value for name, value in changes.items() if not overlay.intercept(name, value)
+            }
+
+        previous = self._tracker.state
+        new_track = _add_track_id(previous, changes)
+        now_ns = time.monotonic_ns()
+        seek_confirmed = "progress_ms" in changes and self._resolve_seek(
+            changes, now_ns, new_track=new_track
+        )
+        progress_reported = "progress_ms" in changes
+        if progress_reported:
+            changes["progress_updated_ns"] = now_ns
+        elif previous.progress_ms is not None and (
+            changes.get("playback_state", previous.playback_state) != previous.playback_state
+            or changes.get("playback_rate", previous.playback_rate) != previous.playback_rate
+        ):
+            # Re-anchor the position so extrapolation stops, resumes or changes pace from here
+            changes["progress_ms"] = previous.position_us(now_ns) // 1000
+            changes["progress_updated_ns"] = now_ns
+
+        self._emit_properties(self._tracker.update(**changes), "update")
+        if seek_confirmed:
+            self._emit_seeked(self._tracker.state.position_us(now_ns))
+        # A new track starts at its own position, which is not a seek
+        elif progress_reported and not new_track:
+            self._check_seeked(previous, now_ns)
+
     def set_metadata(
         self,
         title: str | None = None,
@@ -235,38 +821,180 @@ class SendspinMpris:
         duration_ms: int | None = None,
     ) -> None:
         """Update track metadata."""
-        self._state.title = title
-        self._state.artist = artist
-        self._state.album = album
-        self._state.duration_ms = duration_ms
+        changes: dict[str, object] = {
+            "title": title,
+            "artist": artist,
+            "album": album,
+            "duration_ms": duration_ms,
+        }
+        _ = _add_track_id(self._tracker.state, changes)
+        self._emit_properties(self._tracker.update(**changes), "metadata")
+
+    def set_artwork(self, artwork: str | bytes | None) -> None:
+        """Update the artwork of the current track.
+
+        Args:
+            artwork: URL of the image, e.g. the artwork URL sent with the metadata, the
+                image itself, e.g. as received on the Sendspin artwork channel, or None
+                if the track has no artwork. With an artwork cache, a URL is downloaded
+                and both are published once stored; the previous artwork is cleared
+                in the meantime.
+
+        """
+        if artwork == self._artwork_source:
+            return
 
-        if self._update_notifier is None:
-            _LOGGER.warning("MPRIS update notifier not initialized; cannot emit metadata change")
+        self._artwork_source = artwork
+        _ = self._cancel_artwork()
+
+        if self._artwork_cache is None:
+            if isinstance(artwork, bytes):
+                _LOGGER.debug("Ignoring artwork image: no artwork cache configured")
+            self._apply_art_url(artwork if isinstance(artwork, str) else None)
             return
 
+        self._apply_art_url(None)
+        self._load_artwork()
+
+    def _load_artwork(self) -> None:
+        """Start storing the current artwork in the artwork cache, once running."""
+        if (
+            self._artwork_source is None
+            or self._artwork_cache is None
+            or self._loop is None
+            or not self._running
+        ):
+            return
+        self._artwork_task = self._loop.create_task(
+            self._store_artwork(self._artwork_cache, self._artwork_source)
+        )
+
+    async def _store_artwork(self, cache: ArtworkCache, source: str | bytes) -> None:
+        """Store artwork in the cache and publish its URL."""
         try:
-            self._update_notifier.emitterPlayer.emitPropertyChangeAll()
-        except Exception:
-            _LOGGER.debug("Failed to emit MPRIS metadata change", exc_info=True)
+            if isinstance(source, str):
+                from .artwork import fetch_image
 
-    def set_progress(self, progress_ms: int | None) -> None:
-        """Update track progress."""
-        self._state.progress_ms = progress_ms
+                async with asyncio.timeout(_ARTWORK_FETCH_TIMEOUT):
+                    source = await fetch_image(source)
+            url = await cache.store(source)
+        except Exception as err:
+            _LOGGER.warning("Failed to cache MPRIS artwork: %s", err)
+            return
+        finally:
+            if self._artwork_task is asyncio.current_task():
+                self._artwork_task = None
+        self._apply_art_url(url)
+
+    def _stop_artwork(self) -> None:
+        """Cancel storing the artwork; if not published yet, it is loaded on its next report."""
+        if self._cancel_artwork():
+            self._artwork_source = None
+
+    def _cancel_artwork(self) -> bool:
+        """Cancel storing the current artwork, and return whether it was still ongoing."""
+        task = self._artwork_task
+        if task is None:
+            return False
+        self._artwork_task = None
+        return task.cancel()
+
+    def _apply_art_url(self, art_url: str | None) -> None:
+        self._emit_properties(self._tracker.update(art_url=art_url), "artwork")
+
+    def set_progress(self, progress_ms: int | None, playback_rate: float | None = None) -> None:
+        """Update track progress.
+
+        The progress is anchored to the current monotonic time, so the position
+        reported to MPRIS clients advances on its own while playing. The Seeked signal
+        is only emitted when the progress jumps away from the extrapolated position by
+        more than the seek threshold (user seek, server resync, track restart).
+
+        Args:
+            progress_ms: Track progress in milliseconds, or None if unknown.
+            playback_rate: Playback speed multiplier (1.0 is normal speed), or None to
+                keep the current one.
+
+        """
+        now_ns = time.monotonic_ns()
+        previous = self._tracker.state
+        changes: dict[str, object] = {"progress_ms": progress_ms}
+        if playback_rate is not None:
+            changes["playback_rate"] = playback_rate
+        seek_confirmed = self._resolve_seek(changes, now_ns, new_track=False)
+        if "progress_ms" not in changes:
+            _ = self._tracker.update(**changes)
+            return
+
+        _ = self._tracker.update(progress_updated_ns=now_ns, **changes)
+        if seek_confirmed:
+            self._emit_seeked(self._tracker.state.position_us(now_ns))
+        else:
+            self._check_seeked(previous, now_ns)
+
+    def _apply_seek(self, position_ms: int) -> None:
+        """Move the local position to the target of a seek issued through MPRIS.
+
+        The Seeked signal is only emitted once the server reports a matching progress.
+        """
+        now_ns = time.monotonic_ns()
+        self._seek_deadline_ns = now_ns + int(self._command_timeout * 1e9)
+        _ = self._tracker.update(progress_ms=position_ms, progress_updated_ns=now_ns)
+
+    def _resolve_seek(self, changes: dict[str, object], now_ns: int, *, new_track: bool) -> bool:
+        """Match a reported progress against the seek awaiting confirmation, if any.
+
+        Returns True when the progress confirms the seek. A progress the server reported
+        before applying the seek is removed from `changes`, so the local position does
+        not jump back, until the seek is abandoned after the command timeout.
+        """
+        deadline_ns = self._seek_deadline_ns
+        if deadline_ns is None:
+            return False
+
+        progress_ms = cast("int | None", changes["progress_ms"])
+        if new_track or progress_ms is None or now_ns >= deadline_ns:
+            self._seek_deadline_ns = None
+            return False
+
+        drift_us = abs(progress_ms * 1000 - self._tracker.state.position_us(now_ns))
+        if drift_us <= self._seek_threshold_ms * 1000:
+            self._seek_deadline_ns = None
+            return True
+
+        del changes["progress_ms"]
+        return False
+
+    def _check_seeked(self, previous: MprisState, now_ns: int) -> None:
+        """Emit Seeked if the progress just reported jumped away from the previous state."""
+        progress_ms = self._tracker.state.progress_ms
+        if progress_ms is None or previous.progress_ms is None:
+            return
+        drift_us = abs(progress_ms * 1000 - previous.position_us(now_ns))
+        if drift_us > self._seek_threshold_ms * 1000:
+            # Clamped like the Position property, so both report the same position
+            self._emit_seeked(self._tracker.state.position_us(now_ns))
 
     def set_playback_state(self, state: PlaybackStateType) -> None:
         """Update playback state."""
-        self._state.playback_state = state
-
-        if self._update_notifier is None:
-            _LOGGER.warning(
-                "MPRIS update notifier not initialized; cannot emit playback state change"
-            )
+        if self._overlay is not None and self._overlay.intercept("playback_state", state):
             return
+        self._apply_playback_state(state)
 
-        try:
-            self._update_notifier.emitterPlayer.emitPropertyChangeAll()
-        except Exception:
-            _LOGGER.debug("Failed to emit MPRIS playback state change", exc_info=True)
+    def _apply_playback_state(self, state: PlaybackStateType | None) -> None:
+        """Apply a playback state to the local state and emit the change."""
+        current = self._tracker.state
+        if current.progress_ms is None or current.playback_state == state:
+            properties = self._tracker.update(playback_state=state)
+        else:
+            # Re-anchor the position so extrapolation stops or resumes from here
+            now_ns = time.monotonic_ns()
+            properties = self._tracker.update(
+                playback_state=state,
+                progress_ms=current.position_us(now_ns) // 1000,
+                progress_updated_ns=now_ns,
+            )
+        self._emit_properties(properties, "playback state")
 
     def set_volume(self, volume: int, *, muted: bool = False) -> None:
         """Update group volume.
@@ -276,30 +1004,112 @@ class SendspinMpris:
             muted: Whether the volume is muted.
 
         """
-        self._state.volume = volume
-        self._state.muted = muted
-
-        if self._update_notifier is None:
-            _LOGGER.warning("MPRIS update notifier not initialized; cannot emit volume change")
-            return
-
-        try:
-            self._update_notifier.emitterPlayer.emitPropertyChangeAll()
-        except Exception:
-            _LOGGER.debug("Failed to emit MPRIS volume change", exc_info=True)
+        changes: dict[str, object] = {"volume": volume, "muted": muted}
+        if self._overlay is not None:
+            overlay = self._overlay
+            changes = {
+                name: value for name, value in changes.items() if not overlay.intercept(name, value)
+            }
+        properties = self._tracker.update(**changes)
+        self._emit_properties(properties, "volume")
 
     def set_supported_commands(self, commands: set[MediaCommand]) -> None:
         """Update supported media commands.
 
         This affects which controls are shown as available in MPRIS clients.
         """
-        self._state.supported_commands = commands
+        properties = self._tracker.update(supported_commands=frozenset(commands))
+        self._emit_properties(properties, "options")
 
-        if self._update_notifier is None:
-            _LOGGER.warning("MPRIS update notifier not initialized; cannot emit options change")
+    def _on_command_submitted(
+        self, command: MediaCommand, volume: int | None, mute: bool | None, position_ms: int | None
+    ) -> None:
+        """Optimistically apply the state a command dispatched through MPRIS will produce.
+
+        Seeks always move the local position right away, so scrubbing feels immediate.
+        """
+        if command == SEEK_COMMAND and position_ms is not None:
+            self._apply_seek(position_ms)
+            return
+
+        if self._overlay is None:
+            return
+
+        if (playback_state := _COMMAND_PLAYBACK_STATES.get(command)) is not None:
+            self._overlay.apply(self._tracker.state, {"playback_state": playback_state})
+            self._apply_playback_state(playback_state)
+        elif command == MediaCommand.VOLUME and volume is not None:
+            self._overlay.apply(self._tracker.state, {"volume": volume})
+            self._emit_properties(self._tracker.update(volume=volume), "volume")
+        elif command == MediaCommand.MUTE and mute is not None:
+            self._overlay.apply(self._tracker.state, {"muted": mute})
+            self._emit_properties(self._tracker.update(muted=mute), "volume")
+
+    def _on_optimistic_expired(self, name: str, value: object) -> None:
+        """Roll back an optimistic value the server did not confirm in time."""
+        _LOGGER.debug("Server did not confirm optimistic %s, rolling back", name)
+        if name == "playback_state":
+            self._apply_playback_state(cast("PlaybackStateType | None", value))
+        else:
+            self._emit_properties(self._tracker.update(**{name: value}), "volume")
+
+    def _emit_properties(self, properties: set[str], change: str) -> None:
+        """Schedule the changed Player properties for emission."""
+        if not properties:
+            if self._metrics is not None:
+                self._metrics.increment("mpris_updates_suppressed", change)
+            return
+
+        if self._service is not None:
+            self._service.invalidate_player_properties(properties)
+
+        # Until started, changes are only tracked; they are published once exported
+        if self._scheduler is None:
             return
 
+        if self._batch_received_at is None:
+            self._batch_received_at = self._update_received_at
+
+        self._scheduler.mark(properties)
+
+    def _emit_seeked(self, position_us: int) -> None:
+        """Emit the Seeked signal, after any pending property changes."""
+        if self._scheduler is None or self._service is None:
+            return
+
+        # Flush first so clients see e.g. new metadata before the seek that follows it
+        self._scheduler.flush()
         try:
-            self._update_notifier.emitterPlayer.emitPropertyChangeAll()
+            self._service.emit_seeked(position_us)
         except Exception:
-            _LOGGER.debug("Failed to emit MPRIS options change", exc_info=True)
+            _LOGGER.debug("Failed to emit MPRIS Seeked signal", exc_info=True)
+            return
+
+        if self._metrics is not None:
+            self._metrics.increment("mpris_signals_emitted", "Seeked")
+            if self._update_received_at is not None:
+                self._metrics.observe(
+                    "mpris_update_latency_seconds", time.perf_counter() - self._update_received_at
+                )
+
+    def _flush_properties(self, properties: set[str]) -> None:
+        """Emit one PropertiesChanged signal holding all coalesced Player properties."""
+        received_at = self._batch_received_at
+        self._batch_received_at = None
+        if self._service is None:
+            return
+
+        try:
+            self._service.emit_player_properties(sorted(properties))
+        except Exception:
+            _LOGGER.debug("Failed to emit MPRIS property change", exc_info=True)
+            return
+
+        if self._metrics is not None:
+            self._metrics.increment("mpris_signals_emitted", "PropertiesChanged")
+            for name in properties:
+                self._metrics.increment("mpris_properties_emitted", name)
+            if received_at is not None:
+                self._metrics.observe(
+                    "mpris_update_latency_seconds", time.perf_counter() - received_at
+                )
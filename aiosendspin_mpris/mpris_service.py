@@ -2,21 +2,145 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import itertools
 import logging
-from typing import Any, override
+import random
+import socket
+import threading
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any, cast, override
 
 from dbus_next.aio.message_bus import MessageBus
+from dbus_next.constants import MessageType, RequestNameReply
 from dbus_next.errors import InvalidAddressError
+from dbus_next.message import Message
+from dbus_next.service import ServiceInterface
+from dbus_next.signature import Variant
+from dbus_next.validators import assert_bus_name_valid
 from mpris_api.adapter.IMprisAdapterPlayer import IMprisAdapterPlayer
 from mpris_api.adapter.IMprisAdapterPlayLists import IMprisAdapterPlayLists
 from mpris_api.adapter.IMprisAdapterRoot import IMprisAdapterRoot
 from mpris_api.adapter.IMprisAdapterTrackList import IMprisAdapterTrackList
+from mpris_api.common.dbusDecorators import dbusSignal
+from mpris_api.emitter.MprisEmitterPlayer import MprisEmitterPlayer
+from mpris_api.interface.MprisInterfacePlayer import (
+    MprisInterfacePlayer,
+    MprisPlayerPropertyId,
+    MprisPlayerSignalId,
+)
 from mpris_api.interface.MprisInterfacePlayLists import MprisInterfacePlayLists
 from mpris_api.model.MprisConstant import MprisConstant
 from mpris_api.MprisService import MprisService
 
+if TYPE_CHECKING:
+    from .metrics import MprisMetrics
+
 _LOGGER = logging.getLogger(__name__)
 
+_PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+
+# Player properties whose value changes without any state change, never cached
+_VOLATILE_PLAYER_PROPERTIES = frozenset({MprisPlayerPropertyId.POSITION.value})
+
+
+class _PropertyTable:
+    """Variants of the readable properties of an exported interface, cached until invalidated.
+
+    Values are read from the interface on first use and kept until invalidated, except
+    for volatile properties, which are read on every call. A read that races with an
+    invalidation is served but not cached, so a stale value never outlives its change.
+    """
+
+    _interface: ServiceInterface
+    _properties: dict[str, tuple[str, str]]
+    _volatile: frozenset[str]
+    _variants: dict[str, Variant]
+    _generation: int
+    _lock: threading.Lock
+
+    def __init__(self, interface: ServiceInterface, volatile: Iterable[str] = ()) -> None:
+        self._interface = interface
+        # D-Bus property name -> (signature, name of the Python property returning its value)
+        self._properties = {
+            cast("str", prop.name): (
+                cast("str", prop.signature),
+                cast("str", prop.prop_getter.__name__),  # pyright: ignore[reportUnknownMemberType]
+            )
+            for prop in ServiceInterface._get_properties(interface)  # noqa: SLF001  # pyright: ignore[reportPrivateUsage, reportUnknownVariableType, reportUnknownMemberType]
+            if not prop.disabled and prop.access.readable()  # pyright: ignore[reportUnknownMemberType]
+        }
+        self._volatile = frozenset(volatile)
+        self._variants = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Variant | None:
+        """Return the variant of a property, or None if the interface has no such property."""
+        variant = self._variants.get(name)
+        if variant is not None:
+            return variant
+
+        prop = self._properties.get(name)
+        if prop is None:
+            return None
+
+        signature, attribute = prop
+        generation = self._generation
+        variant = Variant(signature, getattr(self._interface, attribute))
+        if name not in self._volatile:
+            with self._lock:
+                if generation == self._generation:
+                    self._variants[name] = variant
+        return variant
+
+    def get_all(self) -> dict[str, Variant]:
+        """Return the variants of all readable properties."""
+        return {name: cast("Variant", self.get(name)) for name in self._properties}
+
+    def invalidate(self, names: Iterable[str]) -> None:
+        """Drop the cached variants of properties whose value changed."""
+        with self._lock:
+            self._generation += 1
+            for name in names:
+                _ = self._variants.pop(name, None)
+
+
+class _WouldBlockAsPartialSocket:
+    """Socket wrapper reporting a full send buffer as nothing sent, instead of raising."""
+
+    _sock: socket.socket
+
+    def __init__(self, sock: socket.socket) -> None:
+        self._sock = sock
+
+    def send(self, data: memoryview) -> int:
+        try:
+            return self._sock.send(data)
+        except BlockingIOError:
+            return 0
+
+    def sendmsg(self, buffers: list[memoryview], ancdata: list[tuple[int, int, bytes]]) -> int:
+        try:
+            return self._sock.sendmsg(buffers, ancdata)
+        except BlockingIOError:
+            return 0
+
+
+class PatchedMessageBus(MessageBus):
+    """Patched MessageBus to wait for the socket when its send buffer is full.
+
+    The upstream writer sends queued messages back to back and treats EAGAIN as a fatal
+    error, so a burst of signals larger than the socket buffer drops the connection. A
+    short send makes it wait until the socket is writable again instead.
+    """
+
+    def __init__(self) -> None:  # noqa: D107
+        super().__init__()
+        writer = self._writer
+        writer.sock = _WouldBlockAsPartialSocket(cast("socket.socket", writer.sock))
+
 
 class PatchedMprisInterfacePlayLists(MprisInterfacePlayLists):
     """Patched MprisInterfacePlayLists to return lists instead of tuples for D-Bus STRUCT types."""
@@ -30,16 +154,50 @@ class PatchedMprisInterfacePlayLists(MprisInterfacePlayLists):
         return []
 
 
+class PatchedMprisInterfacePlayer(MprisInterfacePlayer):
+    """Patched MprisInterfacePlayer so the Seeked signal carries the new position."""
+
+    @dbusSignal(name=MprisPlayerSignalId.SEEKED.value)
+    @override
+    def seeked(self, position: int) -> "x":  # noqa: F821, UP037  # pyright: ignore[reportUndefinedVariable, reportUnknownParameterType]
+        """Return the Seeked signal body.
+
+        The upstream definition returns nothing, so the signal is sent without its position.
+        """
+        return position
+
+
 class PatchedMprisService(MprisService):
-    """Patched MprisService to handle InvalidAddressError gracefully."""
+    """Patched MprisService to handle a missing session bus gracefully.
+
+    Without a session bus to connect to at start, `on_unavailable` is called and the
+    service stops. Once connected, the service is supervised: when the session bus goes away, it
+    reconnects with exponential backoff and jitter, exports the interfaces again and
+    reclaims its bus name, until it is stopped.
+
+    async_start() returns once the bus name is requested, with the reply of the bus, and
+    async_stop() releases the name before disconnecting, so a restarted player can
+    claim it again right away.
+
+    Properties.Get and GetAll calls on the root and Player interfaces are answered from
+    tables of cached variants, so the adapter getters only run once per change; callers
+    report changed Player properties with invalidate_player_properties().
+    """
 
-    def __init__(  # noqa: D107
+    def __init__(  # noqa: D107, PLR0913
         self,
         name: str,
         adapterRoot: IMprisAdapterRoot,  # noqa: N803
         adapterPlayer: IMprisAdapterPlayer,  # noqa: N803
         adapterTrackList: IMprisAdapterTrackList,  # noqa: N803
         adapterPlayLists: IMprisAdapterPlayLists,  # noqa: N803
+        *,
+        bus_name: str | None = None,
+        reconnect_delay: float = 1.0,
+        reconnect_max_delay: float = 60.0,
+        on_connection_change: Callable[[bool], None] | None = None,
+        on_unavailable: Callable[[], None] | None = None,
+        metrics: MprisMetrics | None = None,
     ) -> None:
         super().__init__(
             name=name,
@@ -48,27 +206,297 @@ class PatchedMprisService(MprisService):
             adapterTrackList=adapterTrackList,
             adapterPlayLists=adapterPlayLists,
         )
+        if bus_name is not None:
+            assert_bus_name_valid(bus_name)
+            self._name: str = bus_name
+        self._interfacePlayer: MprisInterfacePlayer = PatchedMprisInterfacePlayer(
+            adapter=adapterPlayer
+        )
+        self._emitterPlayer: MprisEmitterPlayer = MprisEmitterPlayer(
+            interface=self._interfacePlayer
+        )
         self._interfacePlayLists: MprisInterfacePlayLists | None = PatchedMprisInterfacePlayLists(
             adapter=adapterPlayLists
         )
+        self._task: asyncio.Task[None] | None = None
+        self._reconnect_delay: float = reconnect_delay
+        self._reconnect_max_delay: float = reconnect_max_delay
+        self._on_connection_change: Callable[[bool], None] | None = on_connection_change
+        self._on_unavailable: Callable[[], None] | None = on_unavailable
+        self._metrics: MprisMetrics | None = metrics
+        self._stopping: bool = False
+        self._name_reply: RequestNameReply | None = None
+        self._supervisor_loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._player_properties: _PropertyTable = _PropertyTable(
+            self._interfacePlayer, _VOLATILE_PLAYER_PROPERTIES
+        )
+        self._property_tables: dict[str, _PropertyTable] = {
+            self._interfaceRoot.name: _PropertyTable(self._interfaceRoot),
+            self._interfacePlayer.name: self._player_properties,
+        }
+
+    def invalidate_player_properties(self, names: Iterable[str]) -> None:
+        """Drop the cached values of Player properties whose underlying state changed."""
+        self._player_properties.invalidate(names)
+
+    def emit_player_properties(self, names: Iterable[str]) -> None:
+        """Emit a single PropertiesChanged signal for the given Player properties."""
+        property_ids = [MprisPlayerPropertyId(name) for name in names]
+        if property_ids:
+            self._emitterPlayer.emitPropertyChange(property_ids)
+
+    def emit_seeked(self, position_us: int) -> None:
+        """Emit the Player Seeked signal with the new position in microseconds."""
+        self._emitterPlayer.emitSeeked(position_us)
 
+    @property
     @override
-    async def _loop(self) -> None:
+    def isRunning(self) -> bool:
+        """Return whether the service runs, either in its own thread or in-loop."""
+        task = self._task
+        return (task is not None and not task.done()) or super().isRunning
+
+    @property
+    def name_reply(self) -> RequestNameReply | None:
+        """Return the reply to the last request of the bus name, or None if not made."""
+        return self._name_reply
+
+    async def async_start(self) -> RequestNameReply | None:
+        """Run the service on the running event loop instead of a private thread.
+
+        The message bus is connected, the interfaces are exported and the bus name is
+        requested before this returns; disconnection is then awaited by a task on the
+        same loop.
+
+        Returns:
+            The reply to the bus name request, or None if the session bus is not
+            available (no or an invalid address, or nothing listening on it).
+
+        """
+        if self.isRunning:
+            return self._name_reply
+
+        self._stopping = False
         try:
-            self._messageBus = messageBus = await MessageBus().connect()  # noqa: N806  # pyright: ignore[reportUnannotatedClassAttribute]
+            message_bus = await self._connect()
+        except (InvalidAddressError, OSError) as err:
+            _LOGGER.warning("MPRIS not available: no session bus (%s)", err)
+            self._disconnect()
+            self._notify_unavailable()
+            return None
+        except BaseException:
+            # E.g. cancelled by a start timeout; do not leave a connection behind
+            self._disconnect()
+            raise
+
+        self._task = asyncio.create_task(self._supervise(message_bus))
+        return self._name_reply
+
+    async def async_stop(self) -> None:
+        """Release the bus name, disconnect and wait until the service has stopped.
+
+        May be awaited from any event loop, whether the service runs in its own thread,
+        in-loop or on a bus manager.
+        """
+        loop = self._supervisor_loop
+        if loop is not None and not loop.is_closed():
+            if loop is asyncio.get_running_loop():
+                await self._shutdown()
+            else:
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._shutdown(), loop))
+
+        if self._thread is not None:
+            await asyncio.to_thread(self.stop)
+        else:
+            self.stop()
+
+    async def _shutdown(self) -> None:
+        """Release the bus name and disconnect, on the loop the service runs on."""
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
 
-            messageBus.export(MprisConstant.PATH, self._interfaceRoot)
-            messageBus.export(MprisConstant.PATH, self._interfacePlayer)
-            if self._interfaceTrackList:
-                messageBus.export(MprisConstant.PATH, self._interfaceTrackList)
-            if self._interfacePlayLists:
-                messageBus.export(MprisConstant.PATH, self._interfacePlayLists)
+        message_bus = self._messageBus
+        if message_bus is not None and message_bus.connected:
+            try:
+                _ = await message_bus.release_name(self._name)
+            except Exception as err:
+                _LOGGER.debug("Failed to release MPRIS bus name %s: %s", self._name, err)
+        self._disconnect()
 
-            _ = await messageBus.request_name(self._name)
+        task = self._task
+        if task is not None and task is not asyncio.current_task():
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
 
-            await messageBus.wait_for_disconnect()
+    @override
+    def start(self) -> None:
+        self._stopping = False
+        super().start()
+
+    @override
+    def stop(self) -> None:
+        self._stopping = True
+        self._wake()
+        if self._task is not None:
+            self._disconnect()
+            self._task = None
+        super().stop()
+
+    async def _connect(self) -> MessageBus:
+        """Connect to the session bus, export the interfaces and request the bus name."""
+        self._messageBus = messageBus = await PatchedMessageBus().connect()  # noqa: N806  # pyright: ignore[reportUnannotatedClassAttribute]
+
+        messageBus.export(MprisConstant.PATH, self._interfaceRoot)
+        messageBus.export(MprisConstant.PATH, self._interfacePlayer)
+        if self._interfaceTrackList:
+            messageBus.export(MprisConstant.PATH, self._interfaceTrackList)
+        if self._interfacePlayLists:
+            messageBus.export(MprisConstant.PATH, self._interfacePlayLists)
+
+        if self._metrics is not None:
+            messageBus.add_message_handler(self._record_property_read)
+        messageBus.add_message_handler(self._reply_cached_properties)
+
+        self._name_reply = reply = await messageBus.request_name(self._name)
+        if reply not in {RequestNameReply.PRIMARY_OWNER, RequestNameReply.ALREADY_OWNER}:
+            _LOGGER.warning(
+                "MPRIS bus name %s is owned by another connection (%s)", self._name, reply.name
+            )
+
+        return messageBus
+
+    async def _supervise(self, message_bus: MessageBus) -> None:
+        """Keep the service connected until it is stopped."""
+        self._supervisor_loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        try:
+            while True:
+                self._notify_connection(connected=True)
+                try:
+                    await message_bus.wait_for_disconnect()
+                except Exception:
+                    _LOGGER.debug("MPRIS message bus disconnected with error", exc_info=True)
+                self._messageBus = None
+                self._notify_connection(connected=False)
 
-        except InvalidAddressError:
-            _LOGGER.warning("MPRIS not available: DBus address error")
+                reconnected = await self._reconnect()
+                if reconnected is None:
+                    return
+                message_bus = reconnected
         finally:
             self._disconnect()
+            self._supervisor_loop = self._wakeup = None
+
+    async def _reconnect(self) -> MessageBus | None:
+        """Connect again with exponential backoff, or return None once stopped."""
+        assert self._wakeup is not None
+        for attempt in itertools.count():
+            if self._stopping:
+                return None
+
+            delay = min(self._reconnect_max_delay, self._reconnect_delay * (1 << min(attempt, 32)))
+            delay *= random.uniform(0.5, 1.0)  # noqa: S311
+            _LOGGER.log(
+                logging.WARNING if attempt == 0 else logging.DEBUG,
+                "MPRIS message bus disconnected, reconnecting in %.1f s",
+                delay,
+            )
+            with contextlib.suppress(TimeoutError):
+                _ = await asyncio.wait_for(self._wakeup.wait(), delay)
+            if self._stopping:
+                return None
+
+            try:
+                message_bus = await self._connect()
+            except Exception as err:
+                _LOGGER.debug("MPRIS reconnection attempt %d failed: %s", attempt + 1, err)
+                self._disconnect()
+                self._messageBus = None
+                continue
+
+            if self._stopping:
+                self._disconnect()
+                return None
+            _LOGGER.info("MPRIS message bus reconnected")
+            return message_bus
+        return None
+
+    def _record_property_read(self, message: Message) -> None:
+        """Count incoming Properties.Get and GetAll calls, leaving them to the default handler."""
+        metrics = self._metrics
+        if (
+            metrics is None
+            or message.message_type != MessageType.METHOD_CALL
+            or message.interface != _PROPERTIES_INTERFACE
+        ):
+            return
+
+        body = cast("list[object]", message.body)
+        if message.member == "Get" and message.signature == "ss":
+            metrics.increment("mpris_property_reads", str(body[1]))
+        elif message.member == "GetAll" and message.signature == "s":
+            metrics.increment("mpris_property_read_alls", str(body[0]))
+
+    def _reply_cached_properties(self, message: Message) -> Message | None:
+        """Answer Properties.Get and GetAll from the property tables, without the getters.
+
+        Anything not served from a table, including calls that fail, is left to the
+        default handler, which also produces the D-Bus errors.
+        """
+        if (
+            message.message_type != MessageType.METHOD_CALL
+            or message.interface != _PROPERTIES_INTERFACE
+            or message.path != MprisConstant.PATH
+        ):
+            return None
+
+        body = cast("list[object]", message.body)
+        try:
+            if message.member == "GetAll" and message.signature == "s":
+                table = self._property_tables.get(cast("str", body[0]))
+                if table is not None:
+                    return Message.new_method_return(message, "a{sv}", [table.get_all()])
+            elif message.member == "Get" and message.signature == "ss":
+                table = self._property_tables.get(cast("str", body[0]))
+                variant = table.get(cast("str", body[1])) if table is not None else None
+                if variant is not None:
+                    return Message.new_method_return(message, "v", [variant])
+        except Exception:
+            _LOGGER.debug("Failed to serve cached MPRIS properties", exc_info=True)
+        return None
+
+    def _wake(self) -> None:
+        """Interrupt a pending reconnection delay."""
+        loop, wakeup = self._supervisor_loop, self._wakeup
+        if loop is not None and wakeup is not None and not loop.is_closed():
+            _ = loop.call_soon_threadsafe(wakeup.set)
+
+    def _notify_unavailable(self) -> None:
+        if self._on_unavailable is None:
+            return
+        try:
+            self._on_unavailable()
+        except Exception:
+            _LOGGER.debug("Error in MPRIS unavailability callback", exc_info=True)
+
+    def _notify_connection(self, *, connected: bool) -> None:
+        if self._on_connection_change is None:
+            return
+        try:
+            self._on_connection_change(connected)
+        except Exception:
+            _LOGGER.debug("Error in MPRIS connection callback", exc_info=True)
+
+    @override
+    async def _loop(self) -> None:
+        try:
+            message_bus = await self._connect()
+        except (InvalidAddressError, OSError) as err:
+            _LOGGER.warning("MPRIS not available: no session bus (%s)", err)
+            self._disconnect()
+            self._notify_unavailable()
+            return
+
+        await self._supervise(message_bus)
@@ -0,0 +1,103 @@
+"""Optimistic local state for commands awaiting server confirmation."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from .state import MprisState
+
+
+class OptimisticOverlay:
+    """Track optimistic values of state fields until the server confirms them.
+
+    apply() records the value a dispatched command is expected to produce for each
+    field, together with the field's last authoritative value. Until the server
+    reports the expected value, conflicting authoritative updates are held back
+    instead of making the desktop flicker. If no confirmation arrives within
+    `timeout` seconds, the last authoritative value is handed to `on_expire` so the
+    optimistic change can be rolled back.
+
+    All methods must be called from the event loop thread.
+    """
+
+    _loop: asyncio.AbstractEventLoop
+    _timeout: float
+    _on_expire: Callable[[str, object], None]
+    _expected: dict[str, object]
+    _authoritative: dict[str, object]
+    _handles: dict[str, asyncio.TimerHandle]
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        on_expire: Callable[[str, object], None],
+        *,
+        timeout: float,
+    ) -> None:
+        """Initialize the overlay.
+
+        Args:
+            loop: Event loop used for the confirmation timeouts.
+            on_expire: Called with a field name and its authoritative value when an
+                optimistic value was not confirmed in time.
+            timeout: Seconds to wait for the server to confirm an optimistic value.
+
+        """
+        self._loop = loop
+        self._timeout = timeout
+        self._on_expire = on_expire
+        self._expected = {}
+        self._authoritative = {}
+        self._handles = {}
+
+    def apply(self, state: MprisState, changes: Mapping[str, object]) -> None:
+        """Record optimistic values for fields, given the current state snapshot."""
+        for name, value in changes.items():
+            if name not in self._expected:
+                self._authoritative[name] = cast("object", getattr(state, name))
+            self._expected[name] = value
+
+            handle = self._handles.pop(name, None)
+            if handle is not None:
+                handle.cancel()
+            self._handles[name] = self._loop.call_later(self._timeout, self._expire, name)
+
+    def intercept(self, name: str, value: object) -> bool:
+        """Filter an authoritative server value for a field.
+
+        Returns True when the value must be held back because the field still shows
+        an unconfirmed optimistic value. A value matching the optimistic one confirms
+        it and is let through.
+        """
+        if name not in self._expected:
+            return False
+
+        if value == self._expected[name]:
+            self._clear(name)
+            return False
+
+        self._authoritative[name] = value
+        return True
+
+    def cancel(self) -> None:
+        """Forget all optimistic values without rolling them back."""
+        for handle in self._handles.values():
+            handle.cancel()
+        self._handles.clear()
+        self._expected.clear()
+        self._authoritative.clear()
+
+    def _clear(self, name: str) -> None:
+        handle = self._handles.pop(name, None)
+        if handle is not None:
+            handle.cancel()
+        _ = self._expected.pop(name, None)
+        _ = self._authoritative.pop(name, None)
+
+    def _expire(self, name: str) -> None:
+        value = self._authoritative.get(name)
+        self._clear(name)
+        self._on_expire(name, value)
@@ -0,0 +1,262 @@
+"""Record and replay the state events a SendspinClient delivers to its listeners."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, cast
+
+from aiosendspin.models.core import GroupUpdateServerPayload, ServerStatePayload
+
+if TYPE_CHECKING:
+    from os import PathLike
+
+    from aiosendspin.client import SendspinClient
+    from aiosendspin.models.types import MediaCommand
+
+_LOGGER = logging.getLogger(__name__)
+
+# Event kinds, named after the client listener that receives them
+METADATA = "metadata"
+GROUP_UPDATE = "group_update"
+CONTROLLER_STATE = "controller_state"
+
+
+@dataclass(frozen=True, slots=True)
+class RecordedEvent:
+    """A payload delivered to a client listener, and when it was delivered."""
+
+    time: float
+    """Seconds since the start of the recording."""
+    kind: str
+    """METADATA, GROUP_UPDATE or CONTROLLER_STATE."""
+    payload: ServerStatePayload | GroupUpdateServerPayload
+
+
+def load_events(path: str | PathLike[str]) -> list[RecordedEvent]:
+    """Read the events of a recording made by EventRecorder."""
+    events: list[RecordedEvent] = []
+    with Path(path).open(encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = cast("dict[str, object]", json.loads(line))
+            kind = cast("str", record["kind"])
+            data = cast("dict[str, object]", record["payload"])
+            if kind in {METADATA, CONTROLLER_STATE}:
+                payload = ServerStatePayload.from_dict(data)  # pyright: ignore[reportUnknownMemberType]
+            elif kind == GROUP_UPDATE:
+                payload = GroupUpdateServerPayload.from_dict(data)  # pyright: ignore[reportUnknownMemberType]
+            else:
+                raise ValueError(f"Unknown event kind in recording: {kind}")
+            events.append(RecordedEvent(cast("float", record["time"]), kind, payload))
+    return events
+
+
+class EventRecorder:
+    """Record the state events a SendspinClient delivers, to a JSONL file.
+
+    Every metadata, group update and controller state payload received by the client
+    is written as one line holding the seconds since recording started, the event kind
+    and the payload, e.g. to reproduce production traffic offline with EventReplayer.
+
+    Lines are written from the event loop, buffered by the file.
+
+    Example usage:
+        ```python
+        recorder = EventRecorder(client, "session.jsonl")
+        recorder.start()
+
+        # Later
+        recorder.stop()
+        ```
+    """
+
+    _client: SendspinClient
+    _path: Path
+    _file: IO[str] | None
+    _started: float
+    _count: int
+    _listener_removers: list[Callable[[], None]]
+
+    def __init__(self, client: SendspinClient, path: str | PathLike[str]) -> None:
+        """Initialize the recorder.
+
+        Args:
+            client: SendspinClient whose events are recorded.
+            path: File the recording is written to; an existing file is replaced.
+
+        """
+        self._client = client
+        self._path = Path(path)
+        self._file = None
+        self._started = 0.0
+        self._count = 0
+        self._listener_removers = []
+
+    @property
+    def count(self) -> int:
+        """Return the number of events recorded so far."""
+        return self._count
+
+    def start(self) -> None:
+        """Open the file and start recording."""
+        if self._file is not None:
+            return
+
+        self._file = self._path.open("w", encoding="utf-8")
+        self._started = time.monotonic()
+        self._count = 0
+        self._listener_removers = [
+            self._client.add_metadata_listener(lambda payload: self._record(METADATA, payload)),
+            self._client.add_group_update_listener(
+                lambda payload: self._record(GROUP_UPDATE, payload)
+            ),
+            self._client.add_controller_state_listener(
+                lambda payload: self._record(CONTROLLER_STATE, payload)
+            ),
+        ]
+
+    def stop(self) -> None:
+        """Stop recording and close the file."""
+        for remover in self._listener_removers:
+            remover()
+        self._listener_removers.clear()
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _record(self, kind: str, payload: ServerStatePayload | GroupUpdateServerPayload) -> None:
+        if self._file is None:
+            return
+
+        record = {
+            "time": round(time.monotonic() - self._started, 6),
+            "kind": kind,
+            "payload": payload.to_dict(),
+        }
+        _ = self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._count += 1
+
+
+class EventReplayer:
+    """Stand-in for a SendspinClient that replays a recording to its listeners.
+
+    Pass it to SendspinMpris in place of the client and start the MPRIS interface as
+    usual; replay() then delivers the recorded payloads to the registered listeners,
+    at the recorded pace, N times faster, or as fast as possible. Commands issued
+    through MPRIS are collected in `commands` instead of being sent anywhere.
+
+    Example usage:
+        ```python
+        replayer = EventReplayer("session.jsonl")
+        mpris = SendspinMpris(cast("SendspinClient", cast("object", replayer)))
+        await mpris.async_start()
+        await replayer.replay(speed=10.0)
+        mpris.stop()
+        ```
+    """
+
+    events: list[RecordedEvent]
+    commands: list[tuple[MediaCommand, int | None, bool | None, int | None]]
+    _metadata_listeners: list[Callable[[ServerStatePayload], None]]
+    _group_listeners: list[Callable[[GroupUpdateServerPayload], None]]
+    _controller_listeners: list[Callable[[ServerStatePayload], None]]
+
+    def __init__(self, source: str | PathLike[str] | list[RecordedEvent]) -> None:
+        """Initialize the replayer.
+
+        Args:
+            source: Path of a recording made by EventRecorder, or already loaded events.
+
+        """
+        self.events = source if isinstance(source, list) else load_events(source)
+        self.commands = []
+        self._metadata_listeners = []
+        self._group_listeners = []
+        self._controller_listeners = []
+
+    def add_metadata_listener(
+        self, callback: Callable[[ServerStatePayload], None]
+    ) -> Callable[[], None]:
+        """Add a listener for recorded metadata events."""
+        self._metadata_listeners.append(callback)
+        return lambda: _discard(self._metadata_listeners, callback)
+
+    def add_group_update_listener(
+        self, callback: Callable[[GroupUpdateServerPayload], None]
+    ) -> Callable[[], None]:
+        """Add a listener for recorded group update events."""
+        self._group_listeners.append(callback)
+        return lambda: _discard(self._group_listeners, callback)
+
+    def add_controller_state_listener(
+        self, callback: Callable[[ServerStatePayload], None]
+    ) -> Callable[[], None]:
+        """Add a listener for recorded controller state events."""
+        self._controller_listeners.append(callback)
+        return lambda: _discard(self._controller_listeners, callback)
+
+    async def send_group_command(
+        self,
+        command: MediaCommand,
+        *,
+        volume: int | None = None,
+        mute: bool | None = None,
+        position_ms: int | None = None,
+    ) -> None:
+        """Collect a group command instead of sending it."""
+        self.commands.append((command, volume, mute, position_ms))
+
+    async def replay(self, speed: float | None = 1.0) -> None:
+        """Deliver all recorded events to the listeners.
+
+        Args:
+            speed: Replay speed relative to the recording (1.0 keeps the recorded
+                pace), or None to deliver the events as fast as possible. The event
+                loop still runs between two events, so scheduled emissions happen.
+
+        Raises:
+            ValueError: If `speed` is zero or negative.
+
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError(f"Replay speed must be positive, got {speed}")
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for event in self.events:
+            delay = 0.0 if speed is None else started + event.time / speed - loop.time()
+            await asyncio.sleep(max(0.0, delay))
+            self._deliver(event)
+
+    def _deliver(self, event: RecordedEvent) -> None:
+        # Listener errors are logged and do not stop the replay, as in the client
+        payload = event.payload
+        if isinstance(payload, GroupUpdateServerPayload):
+            for group_listener in list(self._group_listeners):
+                try:
+                    group_listener(payload)
+                except Exception:
+                    _LOGGER.exception("Error in listener for replayed %s event", event.kind)
+            return
+
+        state_listeners = (
+            self._metadata_listeners if event.kind == METADATA else self._controller_listeners
+        )
+        for state_listener in list(state_listeners):
+            try:
+                state_listener(payload)
+            except Exception:
+                _LOGGER.exception("Error in listener for replayed %s event", event.kind)
+
+
+def _discard[T](items: list[T], item: T) -> None:
+    if item in items:
+        items.remove(item)
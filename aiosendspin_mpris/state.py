@@ -0,0 +1,165 @@
+"""Change-tracked MPRIS state snapshots."""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import TypedDict, cast
+
+from aiosendspin.models.types import MediaCommand, PlaybackStateType
+
+from .commands import SEEK_COMMAND
+
+
+@dataclass(frozen=True, slots=True)
+class MprisState:
+    """Immutable snapshot of the internal state for MPRIS adapter.
+
+    Snapshots are never modified in place. Every change produces a new snapshot with
+    a higher version, published by swapping a single reference, so a reader on the
+    D-Bus thread always sees a consistent set of fields without any locking.
+    """
+
+    version: int = 0
+    supported_commands: frozenset[MediaCommand] = frozenset()
+    playback_state: PlaybackStateType | None = None
+    volume: int = 100
+    muted: bool = False
+    title: str | None = None
+    artist: str | None = None
+    album: str | None = None
+    duration_ms: int | None = None
+    art_url: str | None = None
+    track_id: str | None = None
+    progress_ms: int | None = None
+    progress_updated_ns: int = 0
+    playback_rate: float = 1.0
+
+    def position_us(self, now_ns: int) -> int:
+        """Return the track position in microseconds at the monotonic time `now_ns`.
+
+        The last server-reported progress is extrapolated from its monotonic anchor
+        while playing, and clamped to the track duration when that is known.
+        """
+        if self.progress_ms is None:
+            return 0
+
+        position_us = self.progress_ms * 1000
+        if self.playback_state == PlaybackStateType.PLAYING:
+            elapsed_ns = max(0, now_ns - self.progress_updated_ns)
+            position_us += int(elapsed_ns * self.playback_rate) // 1000
+        if self.duration_ms:
+            position_us = min(position_us, self.duration_ms * 1000)
+        return position_us
+
+
+class StateUpdate(TypedDict, total=False):
+    """Fields SendspinMpris.apply() accepts, all optional."""
+
+    title: str | None
+    artist: str | None
+    album: str | None
+    duration_ms: int | None
+    progress_ms: int | None
+    playback_rate: float
+    playback_state: PlaybackStateType | None
+    volume: int
+    muted: bool
+    supported_commands: set[MediaCommand] | frozenset[MediaCommand]
+
+
+def track_identity(*fields: object) -> str:
+    """Return a stable identity for a track, derived from its metadata fields."""
+    key = "\x1f".join(map(repr, fields))
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+
+# MPRIS Player properties derived from each MprisState field. Position is never
+# broadcast through PropertiesChanged (the MPRIS spec reserves the Seeked signal for it).
+_FIELD_PROPERTIES: dict[str, tuple[str, ...]] = {
+    "playback_state": ("PlaybackStatus",),
+    "volume": ("Volume",),
+    "muted": ("Volume",),
+    "title": ("Metadata",),
+    "artist": ("Metadata",),
+    "album": ("Metadata",),
+    "duration_ms": ("Metadata",),
+    "art_url": ("Metadata",),
+    "track_id": ("Metadata",),
+    "progress_ms": (),
+    "progress_updated_ns": (),
+    "playback_rate": (),
+}
+
+_COMMAND_PROPERTIES: dict[MediaCommand, str] = {
+    MediaCommand.PLAY: "CanPlay",
+    MediaCommand.PAUSE: "CanPause",
+    MediaCommand.NEXT: "CanGoNext",
+    MediaCommand.PREVIOUS: "CanGoPrevious",
+}
+if SEEK_COMMAND is not None:
+    _COMMAND_PROPERTIES[SEEK_COMMAND] = "CanSeek"
+
+
+# Positions of the MprisState fields, to build snapshots without dataclasses.replace()
+_STATE_FIELDS = tuple(field.name for field in fields(MprisState))
+_FIELD_INDEX = {name: index for index, name in enumerate(_STATE_FIELDS)}
+_VERSION_INDEX = _FIELD_INDEX["version"]
+_get_state_values = attrgetter(*_STATE_FIELDS)
+
+
+class MprisStateTracker:
+    """Change-tracking layer over MprisState.
+
+    Every update is compared against the current snapshot; when any field actually
+    changed, a new snapshot is published and the MPRIS Player properties affected by
+    those fields are reported back so callers can emit a minimal PropertiesChanged signal.
+    """
+
+    _state: MprisState
+
+    def __init__(self, state: MprisState | None = None) -> None:
+        """Initialize the tracker."""
+        self._state = state if state is not None else MprisState()
+
+    @property
+    def state(self) -> MprisState:
+        """Return the current state snapshot."""
+        return self._state
+
+    def update(self, **changes: object) -> set[str]:
+        """Apply field changes and return the names of the MPRIS properties they affect.
+
+        Fields whose new value equals the current one are ignored, so an empty set
+        means nothing needs to be emitted.
+        """
+        state = self._state
+        values: list[object] | None = None
+        properties: set[str] = set()
+        for name, value in changes.items():
+            old_value = cast("object", getattr(state, name))
+            if old_value == value:
+                continue
+            if values is None:
+                values = list(cast("tuple[object, ...]", _get_state_values(state)))
+            values[_FIELD_INDEX[name]] = value
+            if name == "supported_commands":
+                toggled = state.supported_commands ^ cast("frozenset[MediaCommand]", value)
+                properties.update(
+                    prop for command, prop in _COMMAND_PROPERTIES.items() if command in toggled
+                )
+            else:
+                properties.update(_FIELD_PROPERTIES[name])
+
+        if values is not None:
+            values[_VERSION_INDEX] = state.version + 1
+            self._state = MprisState(*values)  # pyright: ignore[reportArgumentType]
+        return properties
+
+
+# Every MPRIS Player property derived from MprisState
+PLAYER_PROPERTIES = frozenset(
+    {prop for props in _FIELD_PROPERTIES.values() for prop in props}
+    | set(_COMMAND_PROPERTIES.values())
+)
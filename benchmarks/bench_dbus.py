@@ -0,0 +1,307 @@
+"""Benchmark SendspinMpris end to end against a private D-Bus session bus.
+
+Launches a throwaway `dbus-daemon --session`, starts SendspinMpris on it with an
+EventReplayer standing in for the SendspinClient, and measures from a dbus_next client:
+
+- signals: PropertiesChanged signals emitted per second during a storm of track changes
+- getters: round-trip latency of reading Metadata, PlaybackStatus and Position
+- commands: latency from a PlayPause call to the client's send_group_command
+- memory: Python heap allocated per started instance, each with its own connection
+
+Results are written as JSON, to compare them between releases.
+
+Run with: python benchmarks/bench_dbus.py [--output results.json]
+"""
+
+# pyright: reportPrivateUsage=false, reportUnknownMemberType=false, reportUnknownVariableType=false
+# pyright: reportAttributeAccessIssue=false, reportUnknownArgumentType=false, reportAny=false
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import UTC, datetime
+from importlib.metadata import version
+from typing import TYPE_CHECKING, cast, override
+
+from aiosendspin.models.core import GroupUpdateServerPayload, ServerStatePayload
+from aiosendspin.models.types import MediaCommand, PlaybackStateType
+
+from aiosendspin_mpris import MPRIS_AVAILABLE, EventReplayer, MprisMetrics, SendspinMpris
+from aiosendspin_mpris.replay import GROUP_UPDATE, METADATA, RecordedEvent
+
+if TYPE_CHECKING:
+    from aiosendspin.client import SendspinClient
+    from dbus_next.aio.message_bus import MessageBus
+
+OBJECT_PATH = "/org/mpris/MediaPlayer2"
+PLAYER_INTERFACE = "org.mpris.MediaPlayer2.Player"
+# Player properties read, and the dbus_next proxy methods reading them
+GETTERS = {
+    "Metadata": "get_metadata",
+    "PlaybackStatus": "get_playback_status",
+    "Position": "get_position",
+}
+SIGNAL_TIMEOUT = 10.0
+
+
+class BenchmarkClient(EventReplayer):
+    """EventReplayer that timestamps the group commands it receives."""
+
+    sent_at: list[float]
+    command_sent: asyncio.Event
+
+    def __init__(self, events: list[RecordedEvent]) -> None:
+        """Initialize the client with the events to replay."""
+        super().__init__(events)
+        self.sent_at = []
+        self.command_sent = asyncio.Event()
+
+    @override
+    async def send_group_command(
+        self,
+        command: MediaCommand,
+        *,
+        volume: int | None = None,
+        mute: bool | None = None,
+        position_ms: int | None = None,
+    ) -> None:
+        """Record when the command reached the client."""
+        self.sent_at.append(time.perf_counter())
+        await super().send_group_command(command, volume=volume, mute=mute, position_ms=position_ms)
+        self.command_sent.set()
+
+
+def as_client(client: BenchmarkClient) -> SendspinClient:
+    """Return the client typed as the SendspinClient it stands in for."""
+    return cast("SendspinClient", cast("object", client))
+
+
+def start_bus() -> subprocess.Popen[str]:
+    """Launch a private session bus and point DBUS_SESSION_BUS_ADDRESS at it."""
+    if shutil.which("dbus-daemon") is None:
+        raise SystemExit("dbus-daemon is not installed")
+
+    daemon = subprocess.Popen(
+        ["dbus-daemon", "--session", "--print-address", "--nofork"],  # noqa: S607
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    assert daemon.stdout is not None
+    os.environ["DBUS_SESSION_BUS_ADDRESS"] = daemon.stdout.readline().strip()
+    return daemon
+
+
+def track_changes(count: int) -> list[RecordedEvent]:
+    """Return a playing group update followed by `count` track changes."""
+    events = [
+        RecordedEvent(
+            0.0,
+            GROUP_UPDATE,
+            GroupUpdateServerPayload(playback_state=PlaybackStateType.PLAYING),
+        )
+    ]
+    for track in range(count):
+        payload = ServerStatePayload.from_dict(
+            {
+                "metadata": {
+                    "timestamp": track,
+                    "title": f"Title {track}",
+                    "artist": f"Artist {track % 7}",
+                    "album": f"Album {track % 3}",
+                    "progress": {
+                        "track_progress": 0,
+                        "track_duration": 180_000,
+                        "playback_speed": 1000,
+                    },
+                }
+            }
+        )
+        events.append(RecordedEvent(0.0, METADATA, payload))
+    return events
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Return latency statistics, in microseconds, of samples in seconds."""
+    samples_us = sorted(sample * 1e6 for sample in samples)
+    return {
+        "samples": len(samples_us),
+        "mean_us": round(statistics.fmean(samples_us), 1),
+        "median_us": round(statistics.median(samples_us), 1),
+        "p95_us": round(samples_us[int(len(samples_us) * 0.95) - 1], 1),
+        "max_us": round(samples_us[-1], 1),
+    }
+
+
+async def bench_signals(
+    bus: MessageBus, bus_name: str, client: BenchmarkClient, metrics: MprisMetrics
+) -> dict[str, object]:
+    """Replay a storm of track changes and count the signals emitted and received."""
+    introspection = await bus.introspect(bus_name, OBJECT_PATH)
+    properties = bus.get_proxy_object(bus_name, OBJECT_PATH, introspection).get_interface(
+        "org.freedesktop.DBus.Properties"
+    )
+    received = 0
+    done = asyncio.Event()
+    expected = len(client.events) - 1
+
+    def on_properties_changed(_interface: str, changed: dict[str, object], _: list[str]) -> None:
+        nonlocal received
+        if "Metadata" in changed:
+            received += 1
+            if received >= expected:
+                done.set()
+
+    _ = properties.on_properties_changed(on_properties_changed)
+    metrics.reset()
+
+    started = time.perf_counter()
+    await client.replay(speed=None)
+    emitted_at = time.perf_counter()
+    _ = await asyncio.wait_for(done.wait(), SIGNAL_TIMEOUT)
+    received_at = time.perf_counter()
+    _ = properties.off_properties_changed(on_properties_changed)
+
+    counters = cast("dict[str, dict[str, int]]", metrics.snapshot()["counters"])
+    emitted = counters["mpris_signals_emitted"].get("PropertiesChanged", 0)
+    return {
+        "updates": expected,
+        "signals_emitted": emitted,
+        "signals_received": received,
+        "emitted_per_second": round(emitted / (emitted_at - started)),
+        "received_per_second": round(received / (received_at - started)),
+    }
+
+
+async def bench_getters(bus: MessageBus, bus_name: str, iterations: int) -> dict[str, object]:
+    """Measure the round trip of reading player properties through a client proxy."""
+    introspection = await bus.introspect(bus_name, OBJECT_PATH)
+    player = bus.get_proxy_object(bus_name, OBJECT_PATH, introspection).get_interface(
+        PLAYER_INTERFACE
+    )
+    results: dict[str, object] = {}
+    for prop, method in GETTERS.items():
+        getter = getattr(player, method)
+        samples: list[float] = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            await getter()
+            samples.append(time.perf_counter() - started)
+        results[prop] = summarize(samples)
+    return results
+
+
+async def bench_commands(
+    bus: MessageBus, bus_name: str, client: BenchmarkClient, iterations: int
+) -> dict[str, object]:
+    """Measure the latency from a PlayPause call to the client sending the command."""
+    introspection = await bus.introspect(bus_name, OBJECT_PATH)
+    player = bus.get_proxy_object(bus_name, OBJECT_PATH, introspection).get_interface(
+        PLAYER_INTERFACE
+    )
+    samples: list[float] = []
+    for _ in range(iterations):
+        client.command_sent.clear()
+        started = time.perf_counter()
+        await player.call_play_pause()
+        _ = await asyncio.wait_for(client.command_sent.wait(), SIGNAL_TIMEOUT)
+        samples.append(client.sent_at[-1] - started)
+    return {"PlayPause": summarize(samples)}
+
+
+async def bench_memory(instances: int) -> dict[str, object]:
+    """Measure the Python heap allocated per started SendspinMpris instance."""
+    clients = [BenchmarkClient([]) for _ in range(instances)]
+    _ = gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    players = [
+        SendspinMpris(as_client(client), name=f"Memory{index}")
+        for index, client in enumerate(clients)
+    ]
+    for player in players:
+        _ = await player.async_start()
+    await asyncio.sleep(0.1)
+    _ = gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    for player in players:
+        player.stop()
+    return {"instances": instances, "bytes_per_instance": allocated // instances}
+
+
+async def run(args: argparse.Namespace) -> dict[str, object]:
+    """Run all benchmarks against a private session bus and return their results."""
+    from dbus_next.aio.message_bus import MessageBus
+
+    daemon = start_bus()
+    try:
+        client = BenchmarkClient(track_changes(cast("int", args.updates)))
+        metrics = MprisMetrics()
+        mpris = SendspinMpris(as_client(client), name="Benchmark", metrics=metrics)
+        _ = await mpris.async_start()
+        mpris.set_supported_commands({MediaCommand.PLAY, MediaCommand.PAUSE})
+        assert mpris._service is not None
+        bus_name = mpris._service._name
+
+        bus = await MessageBus().connect()
+        iterations = cast("int", args.iterations)
+        results: dict[str, object] = {
+            "signals": await bench_signals(bus, bus_name, client, metrics),
+            "getters": await bench_getters(bus, bus_name, iterations),
+            "commands": await bench_commands(bus, bus_name, client, iterations),
+        }
+        bus.disconnect()
+        mpris.stop()
+
+        results["memory"] = await bench_memory(cast("int", args.instances))
+    finally:
+        daemon.terminate()
+        _ = daemon.wait()
+    return results
+
+
+def main() -> None:
+    """Parse the arguments, run the benchmarks and write the JSON results."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark SendspinMpris against a private D-Bus session bus."
+    )
+    _ = parser.add_argument("--output", help="file to write the results to (default: stdout)")
+    _ = parser.add_argument("--updates", type=int, default=2000, help="track changes in the storm")
+    _ = parser.add_argument("--iterations", type=int, default=500, help="calls per latency test")
+    _ = parser.add_argument("--instances", type=int, default=20, help="instances for memory")
+    args = parser.parse_args()
+
+    if not MPRIS_AVAILABLE:
+        raise SystemExit("mpris_api is not available")
+
+    report = {
+        "package": version("aiosendspin-mpris"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.now(UTC).isoformat(timespec="seconds"),
+        "results": asyncio.run(run(args)),
+    }
+    output = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        with open(cast("str", args.output), "w", encoding="utf-8") as file:  # noqa: PTH123
+            _ = file.write(output)
+    else:
+        _ = sys.stdout.write(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark the time it takes to import aiosendspin_mpris.
+
+Each measurement runs `python -X importtime` in a fresh interpreter and reads the
+cumulative import time of the package, the time spent in the package's own modules,
+and the cost of the MPRIS modules that are only loaded once the service starts. Exits
+with an error if importing the package pulls in any module outside its budget: the
+MPRIS modules, or package modules other than those in `PACKAGE_MODULES`, such as the
+optional features that are only imported on first access. This makes it double as a
+regression check.
+
+Run with: python benchmarks/bench_import.py
+"""
+
+from __future__ import annotations
+
+import statistics
+import subprocess
+import sys
+
+RUNS = 10
+
+# Modules that must only be imported when the MPRIS service is started
+LAZY_MODULES = ("mpris_api", "dbus_next", "tunit")
+
+# The only package modules `import aiosendspin_mpris` may import
+PACKAGE_MODULES = frozenset(
+    {
+        "aiosendspin_mpris",
+        "aiosendspin_mpris.commands",
+        "aiosendspin_mpris.emission",
+        "aiosendspin_mpris.mpris",
+        "aiosendspin_mpris.optimistic",
+        "aiosendspin_mpris.state",
+    }
+)
+
+
+def import_times(statement: str) -> dict[str, tuple[int, int]]:
+    """Return the self and cumulative import times, in microseconds, of every module imported.
+
+    Only the modules imported by `statement` are included.
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = (int(self_us), int(cumulative))
+    return times
+
+
+def check_budget(times: dict[str, tuple[int, int]]) -> None:
+    """Exit with an error if a module outside the budget of the package was imported."""
+    leaked = [module for module in LAZY_MODULES if module in times]
+    leaked += sorted(
+        module
+        for module in times
+        if module.split(".")[0] == "aiosendspin_mpris" and module not in PACKAGE_MODULES
+    )
+    if leaked:
+        raise SystemExit(f"Importing aiosendspin_mpris imported {', '.join(leaked)}")
+
+
+def main() -> None:
+    """Run the benchmark and print the median import times."""
+    package_us: list[int] = []
+    own_us: list[int] = []
+    lazy_us: list[int] = []
+    for _ in range(RUNS):
+        times = import_times("import aiosendspin_mpris")
+        check_budget(times)
+        package_us.append(times["aiosendspin_mpris"][1])
+        own_us.append(sum(times[module][0] for module in PACKAGE_MODULES if module in times))
+
+        times = import_times("import aiosendspin_mpris.adapter, aiosendspin_mpris.mpris_service")
+        # A submodule's cumulative time includes importing its parent package first
+        lazy_us.append(
+            times["aiosendspin_mpris.adapter"][1]
+            - times["aiosendspin_mpris"][1]
+            + times["aiosendspin_mpris.mpris_service"][1]
+        )
+
+    print(f"{'import aiosendspin_mpris':32s} {statistics.median(package_us) / 1000:8.2f} ms")
+    print(f"{'  of which package modules':32s} {statistics.median(own_us) / 1000:8.2f} ms")
+    print(f"{'deferred until start()':32s} {statistics.median(lazy_us) / 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark the cost of reading MPRIS Metadata from the player adapter.
+
+Compares building the metadata from scratch on every read (the behaviour before the
+version-keyed cache) with the cached getter, both including the D-Bus variant
+marshalling the Player interface performs on every Metadata read.
+
+Run with: python benchmarks/bench_metadata.py
+"""
+
+# pyright: reportPrivateUsage=false
+
+from __future__ import annotations
+
+import asyncio
+import timeit
+from typing import TYPE_CHECKING, cast
+
+from aiosendspin_mpris import MPRIS_AVAILABLE
+from aiosendspin_mpris.commands import CommandQueue
+from aiosendspin_mpris.state import MprisStateTracker
+
+if TYPE_CHECKING:
+    from aiosendspin.client import SendspinClient
+
+ITERATIONS = 20_000
+
+
+def main() -> None:
+    """Run the benchmark and print the per-call cost of each getter variant."""
+    if not MPRIS_AVAILABLE:
+        raise SystemExit("mpris_api is not available")
+
+    from aiosendspin_mpris.adapter import SendspinMprisAdapterPlayer
+
+    loop = asyncio.new_event_loop()
+    tracker = MprisStateTracker()
+    _ = tracker.update(title="Title", artist="Artist", album="Album", duration_ms=215_000)
+    commands = CommandQueue(cast("SendspinClient", object()), loop)
+    adapter = SendspinMprisAdapterPlayer(commands, loop, tracker)
+
+    def uncached() -> None:
+        _ = adapter._build_metadata(tracker.state).getValue()
+
+    def cached() -> None:
+        _ = adapter.getMetadata().getValue()
+
+    volume = 0
+
+    def cached_after_unrelated_update() -> None:
+        nonlocal volume
+        volume = (volume + 1) % 100
+        _ = tracker.update(volume=volume)
+        _ = adapter.getMetadata().getValue()
+
+    def state_update_only() -> None:
+        nonlocal volume
+        volume = (volume + 1) % 100
+        _ = tracker.update(volume=volume)
+
+    results = {
+        "uncached": uncached,
+        "cached": cached,
+        "cached_after_unrelated_update": cached_after_unrelated_update,
+        "state_update_only": state_update_only,
+    }
+    for name, func in results.items():
+        seconds = min(timeit.repeat(func, number=ITERATIONS, repeat=5))
+        print(f"{name:32s} {seconds / ITERATIONS * 1e6:8.2f} us/call")
+
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Benchmark the per-message cost of handling server metadata updates.
+
+Replays a burst of server/state messages, shaped like a recorded session (a track
+change followed by progress-only updates, with the odd partial metadata update),
+through SendspinMpris._on_metadata_update, without a D-Bus service. To compare with an
+earlier release, the same burst can be replayed through the package as it was at a git
+revision, e.g. the baseline before metadata fields were merged by _merge_metadata.
+
+Run with: python benchmarks/bench_metadata_update.py [--against REVISION]
+"""
+
+# pyright: reportPrivateUsage=false, reportUnknownMemberType=false
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import timeit
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, cast
+
+from aiosendspin.models.core import ServerStatePayload
+
+from aiosendspin_mpris import SendspinMpris
+
+if TYPE_CHECKING:
+    from aiosendspin.client import SendspinClient
+
+TRACKS = 20
+UPDATES_PER_TRACK = 50
+REPEAT = 20
+
+
+def recorded_burst() -> list[ServerStatePayload]:
+    """Return server/state payloads as they arrive over a session of several tracks."""
+    payloads: list[ServerStatePayload] = []
+    timestamp = 0
+    for track in range(TRACKS):
+        duration = 180_000 + track * 1_000
+        payloads.append(
+            ServerStatePayload.from_dict(
+                {
+                    "metadata": {
+                        "timestamp": timestamp,
+                        "title": f"Title {track}",
+                        "artist": f"Artist {track}",
+                        "album_artist": f"Artist {track}",
+                        "album": f"Album {track // 4}",
+                        "artwork_url": None,
+                        "year": 2020,
+                        "track": track + 1,
+                        "progress": {
+                            "track_progress": 0,
+                            "track_duration": duration,
+                            "playback_speed": 1000,
+                        },
+                    }
+                }
+            )
+        )
+        for update in range(1, UPDATES_PER_TRACK):
+            timestamp += 1_000_000
+            metadata: dict[str, object] = {
+                "timestamp": timestamp,
+                "progress": {
+                    "track_progress": update * 1_000,
+                    "track_duration": duration,
+                    "playback_speed": 1000,
+                },
+            }
+            if update % 10 == 0:
+                metadata["shuffle"] = False
+            payloads.append(ServerStatePayload.from_dict({"metadata": metadata}))
+    return payloads
+
+
+def prepare(mpris: SendspinMpris, loop: asyncio.AbstractEventLoop) -> None:
+    """Make an unstarted SendspinMpris record its emissions without a D-Bus service.
+
+    Emissions are collected but never flushed, so only the handler itself is measured.
+    """
+    if hasattr(mpris, "_update_notifier"):
+        # Revisions that emitted every change straight through the service's notifier
+        emitter = SimpleNamespace(emitPropertyChangeAll=lambda: None)
+        setattr(mpris, "_update_notifier", SimpleNamespace(emitterPlayer=emitter))  # noqa: B010
+    else:
+        from aiosendspin_mpris.emission import EmissionScheduler
+
+        mpris._scheduler = EmissionScheduler(loop, lambda _: None)
+
+
+def measure() -> float:
+    """Return the per-message cost, in microseconds, of the importable handler."""
+    loop = asyncio.new_event_loop()
+    payloads = recorded_burst()
+    mpris = SendspinMpris(cast("SendspinClient", object()))
+    prepare(mpris, loop)
+
+    def handle() -> None:
+        for payload in payloads:
+            mpris._on_metadata_update(payload)
+
+    seconds = min(timeit.repeat(handle, number=1, repeat=REPEAT))
+    loop.close()
+    return seconds / len(payloads) * 1e6
+
+
+def measure_revision(revision: str) -> float:
+    """Return the per-message cost of the handler in the package at a git revision."""
+    root = Path(__file__).resolve().parent.parent
+    with tempfile.TemporaryDirectory() as tree:
+        archive = subprocess.run(  # noqa: S603
+            ["git", "archive", revision, "aiosendspin_mpris"],  # noqa: S607
+            cwd=root,
+            capture_output=True,
+            check=True,
+        )
+        with tarfile.open(fileobj=io.BytesIO(archive.stdout)) as tar:
+            tar.extractall(tree, filter="data")
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, __file__, "--measure"],
+            env={**os.environ, "PYTHONPATH": tree},
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    return float(result.stdout)
+
+
+def main() -> None:
+    """Parse the arguments, run the benchmark and print the per-message cost."""
+    parser = argparse.ArgumentParser(description="Benchmark handling server metadata updates.")
+    _ = parser.add_argument(
+        "--against", metavar="REVISION", help="also measure the package at a git revision"
+    )
+    _ = parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if cast("bool", args.measure):
+        print(measure())
+        return
+
+    results = {"working tree": measure()}
+    if against := cast("str | None", args.against):
+        results[against] = measure_revision(against)
+    for name, cost in results.items():
+        print(f"{name:32s} {cost:8.2f} us/message")
+
+
+if __name__ == "__main__":
+    main()
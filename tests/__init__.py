@@ -0,0 +1 @@
+"""Tests for aiosendspin_mpris."""
@@ -0,0 +1,114 @@
+"""Shared fixtures: a private session bus and SendspinMpris instances running on it."""
+
+# pyright: reportUnknownMemberType=false, reportUnknownVariableType=false, reportAny=false
+# pyright: reportAttributeAccessIssue=false, reportUnknownArgumentType=false
+# pyright: reportExplicitAny=false, reportPrivateUsage=false, reportUnknownLambdaType=false
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, cast
+
+import pytest
+import pytest_asyncio
+
+from aiosendspin_mpris import MPRIS_AVAILABLE, EventReplayer, SendspinMpris
+from aiosendspin_mpris.replay import RecordedEvent
+
+if TYPE_CHECKING:
+    from aiosendspin.client import SendspinClient
+    from aiosendspin.models.core import GroupUpdateServerPayload, ServerStatePayload
+
+OBJECT_PATH = "/org/mpris/MediaPlayer2"
+
+
+def as_client(replayer: EventReplayer) -> SendspinClient:
+    """Return a replayer typed as the SendspinClient it stands in for."""
+    return cast("SendspinClient", cast("object", replayer))
+
+
+async def deliver(
+    replayer: EventReplayer, kind: str, payload: ServerStatePayload | GroupUpdateServerPayload
+) -> None:
+    """Deliver one event to the listeners registered on a replayer."""
+    replayer.events = [RecordedEvent(0.0, kind, payload)]
+    await replayer.replay(speed=None)
+
+
+@dataclass
+class Player:
+    """A started SendspinMpris, its stand-in client and a D-Bus client to observe it."""
+
+    mpris: SendspinMpris
+    client: EventReplayer
+    player: Any
+    properties: Any
+    changes: list[dict[str, Any]]
+    seeks: list[int]
+
+
+@pytest.fixture
+def session_bus() -> Iterator[str]:
+    """Run a private dbus-daemon and point DBUS_SESSION_BUS_ADDRESS at it."""
+    if not MPRIS_AVAILABLE or shutil.which("dbus-daemon") is None:
+        pytest.skip("MPRIS or dbus-daemon not available")
+
+    daemon = subprocess.Popen(
+        ["dbus-daemon", "--session", "--print-address", "--nofork"],  # noqa: S607
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    assert daemon.stdout is not None
+    address = daemon.stdout.readline().strip()
+    previous = os.environ.get("DBUS_SESSION_BUS_ADDRESS")
+    os.environ["DBUS_SESSION_BUS_ADDRESS"] = address
+    try:
+        yield address
+    finally:
+        if previous is None:
+            _ = os.environ.pop("DBUS_SESSION_BUS_ADDRESS", None)
+        else:
+            os.environ["DBUS_SESSION_BUS_ADDRESS"] = previous
+        daemon.terminate()
+        _ = daemon.wait()
+
+
+@pytest_asyncio.fixture
+async def started(session_bus: str, request: pytest.FixtureRequest) -> AsyncIterator[Player]:
+    """Start SendspinMpris in-loop on the private bus, with a D-Bus client observing it.
+
+    Options for SendspinMpris are taken from the `mpris_options` marker of the test.
+    """
+    from dbus_next.aio.message_bus import MessageBus
+
+    marker = request.node.get_closest_marker("mpris_options")
+    options = cast("dict[str, Any]", marker.kwargs) if marker is not None else {}
+    events: list[RecordedEvent] = []
+    client = EventReplayer(events)
+    mpris = SendspinMpris(as_client(client), name="Test", **options)
+    _ = await mpris.async_start()
+    assert mpris._service is not None
+    bus_name = mpris._service._name
+
+    bus = await MessageBus(session_bus).connect()
+    introspection = await bus.introspect(bus_name, OBJECT_PATH)
+    proxy = bus.get_proxy_object(bus_name, OBJECT_PATH, introspection)
+    player = proxy.get_interface("org.mpris.MediaPlayer2.Player")
+    properties = proxy.get_interface("org.freedesktop.DBus.Properties")
+
+    changes: list[dict[str, Any]] = []
+    seeks: list[int] = []
+    properties.on_properties_changed(
+        lambda _interface, changed, _invalidated: changes.append(changed)
+    )
+    player.on_seeked(seeks.append)
+    try:
+        yield Player(mpris, client, player, properties, changes, seeks)
+    finally:
+        bus.disconnect()
+        await mpris.async_stop()
@@ -0,0 +1,68 @@
+"""Tests of MprisBusManager against a private session bus."""
+
+# pyright: reportPrivateUsage=false, reportUnknownMemberType=false, reportAttributeAccessIssue=false
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import logging
+
+import pytest
+
+from aiosendspin_mpris import EventReplayer, MprisBusManager, SendspinMpris
+
+from .conftest import as_client
+
+
+async def test_close_stops_attached_players(
+    session_bus: str, caplog: pytest.LogCaptureFixture
+) -> None:
+    _ = session_bus
+    manager = MprisBusManager()
+    players = [
+        SendspinMpris(as_client(EventReplayer([])), name="Test", bus_manager=manager)
+        for _ in range(3)
+    ]
+    for player in players:
+        assert await player.async_start() is not None
+
+    with caplog.at_level(logging.DEBUG):
+        # One detach still in flight while the manager closes
+        players[1].stop()
+        manager.close()
+        await asyncio.sleep(0)
+        _ = gc.collect()
+
+    assert not any(player._running for player in players)
+    assert "Task was destroyed" not in caplog.text
+    assert "could not shut down socket" not in caplog.text
+    assert manager._thread is None
+
+
+async def test_stop_waits_for_the_bus_name_release(session_bus: str) -> None:
+    from dbus_next.aio.message_bus import MessageBus
+
+    manager = MprisBusManager()
+    mpris = SendspinMpris(as_client(EventReplayer([])), name="Test", bus_manager=manager)
+    reply = await mpris.async_start()
+    assert reply is not None
+    assert await mpris.async_start() == reply
+    service = mpris._service
+    assert service is not None
+    bus_name = service._name
+
+    bus = await MessageBus(session_bus).connect()
+    try:
+        introspection = await bus.introspect("org.freedesktop.DBus", "/org/freedesktop/DBus")
+        proxy = bus.get_proxy_object("org.freedesktop.DBus", "/org/freedesktop/DBus", introspection)
+        dbus = proxy.get_interface("org.freedesktop.DBus")
+        assert await dbus.call_name_has_owner(bus_name)
+
+        mpris.stop()
+        # Stopped and supervisor task done by the time stop() returns
+        assert service._supervisor_loop is None
+        assert not await dbus.call_name_has_owner(bus_name)
+    finally:
+        bus.disconnect()
+        manager.close()
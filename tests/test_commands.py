@@ -0,0 +1,84 @@
+"""Tests for the outbound command queue."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import override
+
+from aiosendspin.models.types import MediaCommand
+
+from aiosendspin_mpris import EventReplayer, MprisMetrics
+from aiosendspin_mpris.commands import CommandQueue
+
+from .conftest import as_client
+
+
+class HangingClient(EventReplayer):
+    """Client whose commands are never acknowledged."""
+
+    @override
+    async def send_group_command(
+        self,
+        command: MediaCommand,
+        *,
+        volume: int | None = None,
+        mute: bool | None = None,
+        position_ms: int | None = None,
+    ) -> None:
+        """Record the command, then wait forever."""
+        await super().send_group_command(command, volume=volume, mute=mute, position_ms=position_ms)
+        _ = await asyncio.Event().wait()
+
+
+async def test_coalesced_volume_delivers_final_value() -> None:
+    client = EventReplayer([])
+    queue = CommandQueue(as_client(client), asyncio.get_running_loop(), max_rate=10.0)
+
+    for volume in range(10, 60, 10):
+        queue.submit(MediaCommand.VOLUME, volume=volume)
+    await asyncio.sleep(0.25)
+
+    # The first value is sent right away, the intermediate ones are dropped
+    assert [command[1] for command in client.commands] == [10, 50]
+
+
+async def test_transport_commands_are_not_coalesced() -> None:
+    client = EventReplayer([])
+    queue = CommandQueue(as_client(client), asyncio.get_running_loop())
+
+    queue.submit(MediaCommand.PLAY)
+    queue.submit(MediaCommand.PAUSE)
+    await asyncio.sleep(0)
+
+    assert [command[0] for command in client.commands] == [MediaCommand.PLAY, MediaCommand.PAUSE]
+
+
+async def test_command_timeout_is_recorded_as_failure() -> None:
+    client = HangingClient([])
+    metrics = MprisMetrics()
+    queue = CommandQueue(
+        as_client(client), asyncio.get_running_loop(), timeout=0.05, metrics=metrics
+    )
+
+    queue.submit(MediaCommand.PLAY)
+    await asyncio.sleep(0.1)
+
+    assert queue.in_flight == 0
+    counters = metrics.snapshot()["counters"]
+    assert isinstance(counters, dict)
+    assert counters["mpris_commands_failed"] == {"play": 1}
+
+
+async def test_waiting_transport_command_is_replaced() -> None:
+    client = HangingClient([])
+    queue = CommandQueue(as_client(client), asyncio.get_running_loop(), max_in_flight=1)
+
+    queue.submit(MediaCommand.PLAY)
+    queue.submit(MediaCommand.PAUSE)
+    queue.submit(MediaCommand.STOP)
+    await asyncio.sleep(0)
+
+    # PLAY is in flight; PAUSE waited for a slot and was replaced by STOP
+    assert [command[0] for command in client.commands] == [MediaCommand.PLAY]
+    assert queue.in_flight == 1
+    queue.cancel()
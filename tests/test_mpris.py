@@ -0,0 +1,142 @@
+"""End-to-end tests of SendspinMpris against a private session bus."""
+
+# pyright: reportUnknownMemberType=false, reportUnknownVariableType=false, reportAny=false
+# pyright: reportAttributeAccessIssue=false, reportUnknownArgumentType=false
+# pyright: reportExplicitAny=false, reportPrivateUsage=false, reportUnknownLambdaType=false
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from aiosendspin.models.core import GroupUpdateServerPayload, ServerStatePayload
+from aiosendspin.models.types import MediaCommand, PlaybackStateType
+
+from aiosendspin_mpris.commands import SEEK_COMMAND
+from aiosendspin_mpris.replay import GROUP_UPDATE, METADATA
+
+from .conftest import Player, deliver
+
+# Time for signals to travel through the bus
+SETTLE = 0.05
+
+
+def metadata(title: str, progress_ms: int, duration_ms: int = 200_000) -> ServerStatePayload:
+    """Return a metadata update for a track by "Artist" at the given progress."""
+    return ServerStatePayload.from_dict(
+        {
+            "metadata": {
+                "timestamp": 0,
+                "title": title,
+                "artist": "Artist",
+                "album": "Album",
+                "progress": {
+                    "track_progress": progress_ms,
+                    "track_duration": duration_ms,
+                    "playback_speed": 1000,
+                },
+            }
+        }
+    )
+
+
+async def test_burst_emits_one_signal_with_changed_keys(started: Player) -> None:
+    started.mpris.set_metadata(title="Song", artist="Artist")
+    started.mpris.set_volume(40)
+    started.mpris.set_playback_state(PlaybackStateType.PLAYING)
+    started.mpris.set_volume(50)
+    await asyncio.sleep(SETTLE)
+
+    assert len(started.changes) == 1
+    assert set(started.changes[0]) == {"Metadata", "PlaybackStatus", "Volume"}
+    assert started.changes[0]["Volume"].value == 0.5
+
+
+async def test_apply_emits_one_signal(started: Player) -> None:
+    started.mpris.apply(
+        title="Song",
+        volume=30,
+        playback_state=PlaybackStateType.PAUSED,
+        supported_commands={MediaCommand.PLAY},
+    )
+    await asyncio.sleep(SETTLE)
+
+    assert len(started.changes) == 1
+    assert set(started.changes[0]) == {"CanPlay", "Metadata", "PlaybackStatus", "Volume"}
+
+
+async def test_unchanged_update_emits_nothing(started: Player) -> None:
+    started.mpris.set_volume(40)
+    await asyncio.sleep(SETTLE)
+    started.mpris.set_volume(40)
+    await asyncio.sleep(SETTLE)
+
+    assert len(started.changes) == 1
+
+
+@pytest.mark.mpris_options(optimistic_timeout=0.1)
+async def test_optimistic_play_rolls_back(started: Player) -> None:
+    started.mpris.set_supported_commands({MediaCommand.PLAY, MediaCommand.PAUSE})
+    started.mpris.set_playback_state(PlaybackStateType.PAUSED)
+    await asyncio.sleep(SETTLE)
+
+    await started.player.call_play()
+    await asyncio.sleep(SETTLE)
+    assert started.client.commands[-1][0] == MediaCommand.PLAY
+    assert await started.player.get_playback_status() == "Playing"
+
+    # The server never confirms; the stale state it reports is held back until expiry
+    await deliver(started.client, GROUP_UPDATE, GroupUpdateServerPayload(PlaybackStateType.PAUSED))
+    assert await started.player.get_playback_status() == "Playing"
+    await asyncio.sleep(0.15)
+
+    assert await started.player.get_playback_status() == "Paused"
+    assert started.changes[-1]["PlaybackStatus"].value == "Paused"
+
+
+async def test_progress_jump_emits_seeked(started: Player) -> None:
+    await deliver(started.client, METADATA, metadata("Song", 10_000))
+    await deliver(started.client, METADATA, metadata("Song", 90_000))
+    await asyncio.sleep(SETTLE)
+
+    assert started.seeks == [90_000_000]
+
+
+async def test_new_track_does_not_emit_seeked(started: Player) -> None:
+    await deliver(started.client, METADATA, metadata("Song", 150_000))
+    await deliver(started.client, METADATA, metadata("Next song", 0))
+    await asyncio.sleep(SETTLE)
+
+    assert started.seeks == []
+    assert started.changes[-1]["Metadata"].value["xesam:title"].value == "Next song"
+
+
+@pytest.mark.skipif(SEEK_COMMAND is None, reason="aiosendspin has no seek command")
+async def test_confirmed_seek_emits_seeked(started: Player) -> None:
+    assert SEEK_COMMAND is not None
+    started.mpris.set_supported_commands({SEEK_COMMAND})
+    await deliver(started.client, METADATA, metadata("Song", 10_000))
+    track_id = (await started.player.get_metadata())["mpris:trackid"].value
+
+    await started.player.call_set_position(track_id, 60_000_000)
+    await asyncio.sleep(SETTLE)
+    assert started.client.commands[-1][3] == 60_000
+    assert await started.player.get_position() == 60_000_000
+    assert started.seeks == []
+
+    # Progress from before the seek is held back; the matching one confirms it
+    await deliver(started.client, METADATA, metadata("Song", 10_500))
+    assert started.seeks == []
+    await deliver(started.client, METADATA, metadata("Song", 60_000))
+    await asyncio.sleep(SETTLE)
+
+    assert started.seeks == [60_000_000]
+
+
+async def test_set_progress_keeps_playback_rate(started: Player) -> None:
+    started.mpris.apply(playback_rate=0.5, playback_state=PlaybackStateType.PLAYING)
+    started.mpris.set_progress(10_000)
+    assert started.mpris._tracker.state.playback_rate == 0.5
+
+    started.mpris.set_progress(20_000, playback_rate=2.0)
+    assert started.mpris._tracker.state.playback_rate == 2.0
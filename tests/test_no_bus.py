@@ -0,0 +1,62 @@
+"""Tests of SendspinMpris starting without a session bus."""
+
+# pyright: reportPrivateUsage=false
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import pytest
+
+from aiosendspin_mpris import EventReplayer, SendspinMpris
+
+from .conftest import as_client
+
+MISSING_BUS = "unix:path=/nonexistent/bus"
+
+
+async def test_async_start_retries_once_a_bus_appears(
+    session_bus: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    mpris = SendspinMpris(as_client(EventReplayer([])), name="Test")
+    monkeypatch.setenv("DBUS_SESSION_BUS_ADDRESS", MISSING_BUS)
+    assert await mpris.async_start() is None
+    assert mpris._disabled
+
+    monkeypatch.setenv("DBUS_SESSION_BUS_ADDRESS", session_bus)
+    assert await mpris.async_start() is not None
+    try:
+        assert not mpris._disabled
+        mpris.set_metadata(title="Title")
+        assert mpris._tracker.state.title == "Title"
+    finally:
+        await mpris.async_stop()
+
+
+async def test_start_logs_started_only_once_connected(
+    session_bus: str, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    mpris = SendspinMpris(as_client(EventReplayer([])), name="Test")
+    monkeypatch.setenv("DBUS_SESSION_BUS_ADDRESS", MISSING_BUS)
+    with caplog.at_level(logging.INFO, logger="aiosendspin_mpris"):
+        mpris.start()
+        for _ in range(100):
+            if mpris._disabled:
+                break
+            await asyncio.sleep(0.01)
+    assert mpris._disabled
+    assert "MPRIS interface started" not in caplog.text
+
+    monkeypatch.setenv("DBUS_SESSION_BUS_ADDRESS", session_bus)
+    with caplog.at_level(logging.INFO, logger="aiosendspin_mpris"):
+        mpris.start()
+        try:
+            for _ in range(100):
+                if mpris._connected:
+                    break
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0)
+            assert "MPRIS interface started" in caplog.text
+        finally:
+            mpris.stop()
@@ -0,0 +1,39 @@
+"""Tests for optimistic state awaiting server confirmation."""
+
+from __future__ import annotations
+
+import asyncio
+
+from aiosendspin.models.types import PlaybackStateType
+
+from aiosendspin_mpris.optimistic import OptimisticOverlay
+from aiosendspin_mpris.state import MprisState
+
+
+async def test_unconfirmed_value_rolls_back_after_timeout() -> None:
+    expired: list[tuple[str, object]] = []
+    overlay = OptimisticOverlay(
+        asyncio.get_running_loop(), lambda name, value: expired.append((name, value)), timeout=0.05
+    )
+
+    overlay.apply(MprisState(volume=30), {"volume": 80})
+    # A stale authoritative value is held back while the optimistic one is pending
+    assert overlay.intercept("volume", 30)
+    await asyncio.sleep(0.1)
+
+    assert expired == [("volume", 30)]
+    assert not overlay.intercept("volume", 30)
+
+
+async def test_confirmed_value_does_not_roll_back() -> None:
+    expired: list[tuple[str, object]] = []
+    overlay = OptimisticOverlay(
+        asyncio.get_running_loop(), lambda name, value: expired.append((name, value)), timeout=0.05
+    )
+
+    state = MprisState(playback_state=PlaybackStateType.PAUSED)
+    overlay.apply(state, {"playback_state": PlaybackStateType.PLAYING})
+    assert not overlay.intercept("playback_state", PlaybackStateType.PLAYING)
+    await asyncio.sleep(0.1)
+
+    assert expired == []
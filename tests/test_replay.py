@@ -0,0 +1,36 @@
+"""Tests of EventReplayer."""
+
+from __future__ import annotations
+
+import pytest
+from aiosendspin.models.core import GroupUpdateServerPayload
+from aiosendspin.models.types import PlaybackStateType
+
+from aiosendspin_mpris import EventReplayer
+from aiosendspin_mpris.replay import GROUP_UPDATE, RecordedEvent
+
+
+def make_replayer() -> tuple[EventReplayer, list[GroupUpdateServerPayload]]:
+    """Return a replayer of two recorded events and the list it delivers them to."""
+    payload = GroupUpdateServerPayload(playback_state=PlaybackStateType.PLAYING)
+    replayer = EventReplayer(
+        [RecordedEvent(0.0, GROUP_UPDATE, payload), RecordedEvent(0.01, GROUP_UPDATE, payload)]
+    )
+    delivered: list[GroupUpdateServerPayload] = []
+    _ = replayer.add_group_update_listener(delivered.append)
+    return replayer, delivered
+
+
+@pytest.mark.parametrize("speed", [None, 1.0, 10.0])
+async def test_replay_delivers_every_event(speed: float | None) -> None:
+    replayer, delivered = make_replayer()
+    await replayer.replay(speed=speed)
+    assert len(delivered) == 2
+
+
+@pytest.mark.parametrize("speed", [0.0, -1.0])
+async def test_replay_rejects_non_positive_speed(speed: float) -> None:
+    replayer, delivered = make_replayer()
+    with pytest.raises(ValueError, match="must be positive"):
+        await replayer.replay(speed=speed)
+    assert delivered == []
@@ -0,0 +1,44 @@
+"""Tests for the change-tracked MPRIS state."""
+
+from __future__ import annotations
+
+from aiosendspin.models.types import MediaCommand, PlaybackStateType
+
+from aiosendspin_mpris.state import MprisState, MprisStateTracker
+
+
+def test_update_reports_only_affected_properties() -> None:
+    tracker = MprisStateTracker()
+
+    assert tracker.update(title="Song", volume=40) == {"Metadata", "Volume"}
+    assert tracker.state.version == 1
+    assert tracker.update(title="Song", volume=40) == set()
+    assert tracker.state.version == 1
+
+
+def test_supported_commands_report_toggled_capabilities() -> None:
+    tracker = MprisStateTracker()
+    _ = tracker.update(supported_commands=frozenset({MediaCommand.PLAY}))
+
+    changed = tracker.update(supported_commands=frozenset({MediaCommand.PLAY, MediaCommand.NEXT}))
+
+    assert changed == {"CanGoNext"}
+
+
+def test_position_is_extrapolated_and_clamped() -> None:
+    state = MprisState(
+        playback_state=PlaybackStateType.PLAYING,
+        duration_ms=2_000,
+        progress_ms=1_000,
+        progress_updated_ns=0,
+        playback_rate=2.0,
+    )
+
+    assert state.position_us(250_000_000) == 1_500_000
+    assert state.position_us(5_000_000_000) == 2_000_000
+
+
+def test_paused_position_does_not_advance() -> None:
+    state = MprisState(playback_state=PlaybackStateType.PAUSED, progress_ms=1_000)
+
+    assert state.position_us(10_000_000_000) == 1_000_000